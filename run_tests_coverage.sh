@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Script para ejecutar tests unitarios con reporte de cobertura en todos los servicios
-# Uso: ./run_tests_coverage.sh [--html] [--service=NOMBRE_SERVICIO]
+# Uso: ./run_tests_coverage.sh [--html] [--parallel] [--service=NOMBRE_SERVICIO]
 
 set -e
 
@@ -14,6 +14,7 @@ NC='\033[0m' # No Color
 
 # Variables
 GENERATE_HTML=false
+RUN_PARALLEL=false
 SPECIFIC_SERVICE=""
 FAILED_SERVICES=()
 PASSED_SERVICES=()
@@ -26,6 +27,10 @@ for arg in "$@"; do
             GENERATE_HTML=true
             shift
             ;;
+        --parallel)
+            RUN_PARALLEL=true
+            shift
+            ;;
         --service=*)
             SPECIFIC_SERVICE="${arg#*=}"
             shift
@@ -35,6 +40,7 @@ for arg in "$@"; do
             echo ""
             echo "Opciones:"
             echo "  --html              Genera reporte HTML además del reporte de consola"
+            echo "  --parallel          Ejecuta los tests de los BFF en paralelo con pytest-xdist (-n auto)"
             echo "  --service=NOMBRE    Ejecuta tests solo para el servicio especificado"
             echo "  -h, --help          Muestra esta ayuda"
             echo ""
@@ -98,6 +104,12 @@ run_service_tests() {
         pytest_cmd="$pytest_cmd --cov-report=html"
     fi
 
+    # pytest-xdist solo está en las dependencias de desarrollo de los BFF; los
+    # servicios con base de datos comparten archivos sqlite y deben correr en serie
+    if [ "$RUN_PARALLEL" = true ] && [[ "$service" == bff-* ]]; then
+        pytest_cmd="$pytest_cmd -n auto --dist=loadfile"
+    fi
+
     # Ejecutar tests
     if $pytest_cmd; then
         echo -e "\n${GREEN}✓${NC} $service - Tests pasaron exitosamente"
@@ -1,5 +1,14 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from services import (
+    autenticacion_service,
+    clientes_service,
+    ordenes_commands_service,
+    ordenes_queries_service,
+    productos_service,
+)
 from services.health_service import HealthService, get_health_service
 from router.autenticacion import autenticacion_router
 from router.clientes import clientes_router
@@ -11,13 +20,26 @@ import logging
 logging.basicConfig(level=logging.DEBUG, force=True)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Al apagar se cierran los clientes HTTP compartidos con los microservicios
+    autenticacion_service.close_client()
+    await clientes_service.close_client()
+    ordenes_commands_service.close_client()
+    ordenes_queries_service.close_client()
+    productos_service.close_client()
+
+
 app = FastAPI(
     title="MediSupply - BFF Movil",
     description="Backend for Frontend - API Gateway para MediSupply Movil",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    root_path="/movil"
+    root_path="/movil",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -40,12 +62,13 @@ app.include_router(productos_router, prefix="/productos", tags=["productos"])
 app.include_router(ordenes_commands_router, prefix="/ordenes/commands", tags=["ordenes-commands"])
 app.include_router(ordenes_queries_router, prefix="/ordenes/queries", tags=["ordenes-queries"])
 
+
 @app.get("/health")
-def health_check(
+async def health_check(
     details: bool = False,
     health_service: HealthService = Depends(get_health_service)
 ):
-    health_status = health_service.check_overall_health(include_details=details)
+    health_status = await asyncio.to_thread(health_service.check_overall_health, include_details=details)
 
     return health_status
 
@@ -4,19 +4,25 @@ from typing import Dict, Any
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, HEALTH_CHECK_HTTP_TIMEOUT, UPSTREAM_LIMITS
 
 logger = logging.getLogger(__name__)
 
+# Cliente compartido por todas las peticiones: reutiliza las conexiones con el microservicio
+_CLIENT = httpx.Client(limits=UPSTREAM_LIMITS, timeout=DEFAULT_TIMEOUT)
+
 
 class AutenticacionService:
 
     def __init__(self):
         self.base_url = os.getenv("AUTENTICACION_SERVICE_URL", "http://autenticacion-service:3000")
-        self.timeout = 30.0
+        self.timeout = DEFAULT_TIMEOUT
+        self.client = _CLIENT
 
     def health_check(self) -> Dict[str, Any]:
         try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
+            response = self.client.get(f"{self.base_url}/health", timeout=HEALTH_CHECK_HTTP_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
@@ -44,7 +50,7 @@ class AutenticacionService:
         """
         try:
             encoded_data = jsonable_encoder(register_data)
-            response = httpx.post(
+            response = self.client.post(
                 f"{self.base_url}/auth/register",
                 json=encoded_data,
                 timeout=self.timeout
@@ -77,7 +83,7 @@ class AutenticacionService:
             HTTPException: Si las credenciales son inválidas
         """
         try:
-            response = httpx.post(
+            response = self.client.post(
                 f"{self.base_url}/auth/login",
                 json=login_data,
                 timeout=self.timeout
@@ -110,7 +116,7 @@ class AutenticacionService:
             HTTPException: Si el token es inválido o expiró
         """
         try:
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.base_url}/auth/me",
                 headers={"Authorization": f"Bearer {token}"},
                 timeout=self.timeout
@@ -129,6 +135,11 @@ class AutenticacionService:
             logger.error(f"Unexpected error getting current user: {e}")
             raise HTTPException(status_code=500, detail=f"Error inesperado: {e}")
 
+@lru_cache
 def get_autenticacion_service() -> AutenticacionService:
     return AutenticacionService()
 
+
+def close_client() -> None:
+    """Cierra el cliente HTTP compartido con el microservicio"""
+    _CLIENT.close()
@@ -3,19 +3,27 @@ import os
 from typing import Dict, Any, List
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, HEALTH_CHECK_HTTP_TIMEOUT, UPSTREAM_LIMITS
 
 logger = logging.getLogger(__name__)
 
+# Clientes compartidos por todas las peticiones: reutilizan las conexiones con el microservicio
+_CLIENT = httpx.Client(limits=UPSTREAM_LIMITS, timeout=DEFAULT_TIMEOUT)
+_ASYNC_CLIENT = httpx.AsyncClient(limits=UPSTREAM_LIMITS, timeout=DEFAULT_TIMEOUT)
+
 
 class ClientesService:
     
     def __init__(self):
         self.base_url = os.getenv("CLIENTES_SERVICE_URL", "http://clientes-service:3000")
-        self.timeout = 30.0
+        self.timeout = DEFAULT_TIMEOUT
+        self.client = _CLIENT
+        self.async_client = _ASYNC_CLIENT
     
     def health_check(self) -> Dict[str, Any]:
         try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
+            response = self.client.get(f"{self.base_url}/health", timeout=HEALTH_CHECK_HTTP_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
@@ -35,7 +43,7 @@ class ClientesService:
                 "Content-Type": "application/json"
             }
             
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.base_url}/api/clientes/asignados",
                 headers=headers,
                 timeout=self.timeout
@@ -67,7 +75,7 @@ class ClientesService:
                 "Content-Type": "application/json"
             }
             
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.base_url}/api/clientes/asignados/{cliente_id}",
                 headers=headers,
                 timeout=self.timeout
@@ -104,14 +112,13 @@ class ClientesService:
             Dict con la información del cliente creado.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/clientes/",
-                    json=register_data,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.async_client.post(
+                f"{self.base_url}/api/clientes/",
+                json=register_data,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"Error registering client: {e.response.text}")
             detail = e.response.json().get("detail", "Error en el registro")
@@ -124,6 +131,12 @@ class ClientesService:
             raise HTTPException(status_code=500, detail="Error inesperado durante el registro del cliente")
 
 # Función de dependencia para inyectar el servicio en los endpoints del BFF
+@lru_cache
 def get_clientes_service() -> ClientesService:
     return ClientesService()
 
+
+async def close_client() -> None:
+    """Cierra los clientes HTTP compartidos con el microservicio"""
+    _CLIENT.close()
+    await _ASYNC_CLIENT.aclose()
@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Any
 import logging
+from functools import lru_cache
 from .autenticacion_service import AutenticacionService
 from .clientes_service import ClientesService
 from .ordenes_commands_service import OrdenesCommandsService
 from .ordenes_queries_service import OrdenesQueriesService
+from .http_client import HEALTH_CHECK_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,33 @@ class HealthService:
             "services": {}
         }
         
-        for service_name, service_instance in self.services.items():
+        # Los health checks son llamadas HTTP bloqueantes: cada consulta usa su propio pool, con un
+        # hilo por servicio, para que el plazo corra desde que arrancan y no detrás de otra consulta
+        executor = ThreadPoolExecutor(max_workers=len(self.services), thread_name_prefix="health-check")
+        try:
+            futures = {
+                service_name: executor.submit(service_instance.health_check)
+                for service_name, service_instance in self.services.items()
+            }
+
+            # Un único plazo para todos: los que no terminan a tiempo se marcan como caídos
+            done, _ = wait(futures.values(), timeout=HEALTH_CHECK_TIMEOUT)
+        finally:
+            # Sin esperar a los colgados: su llamada HTTP está acotada por HEALTH_CHECK_HTTP_TIMEOUT
+            executor.shutdown(wait=False)
+
+        for service_name, future in futures.items():
+            if future not in done:
+                logger.error(f"{service_name} service health check timed out")
+                health_status["services"][service_name] = {
+                    "status": "unhealthy",
+                    "error": f"Health check timed out after {HEALTH_CHECK_TIMEOUT}s"
+                }
+                health_status["status"] = "degraded"
+                continue
+
             try:
-                service_health = service_instance.health_check()
+                service_health = future.result()
                 service_status = {"status": "healthy"}
                 
                 if include_details:
@@ -47,6 +74,7 @@ class HealthService:
 
 
 
+@lru_cache
 def get_health_service() -> HealthService:
     """Dependency function to get health service instance"""
     return HealthService()
@@ -0,0 +1,13 @@
+import httpx
+
+# Pool de conexiones de los clientes compartidos con cada microservicio
+UPSTREAM_LIMITS = httpx.Limits(max_keepalive_connections=5, max_connections=10)
+
+# Timeout por defecto hacia los microservicios: un peer caído falla a los 2s al
+# conectar en vez de consumir 30s, y la lectura conserva margen para respuestas lentas
+DEFAULT_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=5.0, pool=1.0)
+
+# Plazo total del health check agregado: cada llamada /health queda acotada al
+# mismo valor para que un peer colgado no retenga el hilo del pool tras el plazo
+HEALTH_CHECK_TIMEOUT = 2.0
+HEALTH_CHECK_HTTP_TIMEOUT = httpx.Timeout(HEALTH_CHECK_TIMEOUT, pool=DEFAULT_TIMEOUT.pool)
@@ -3,19 +3,25 @@ import os
 from typing import Dict, Any
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, HEALTH_CHECK_HTTP_TIMEOUT, UPSTREAM_LIMITS
 
 logger = logging.getLogger(__name__)
 
+# Cliente compartido por todas las peticiones: reutiliza las conexiones con el microservicio
+_CLIENT = httpx.Client(limits=UPSTREAM_LIMITS, timeout=DEFAULT_TIMEOUT)
+
 
 class OrdenesCommandsService:
     
     def __init__(self):
         self.base_url = os.getenv("ORDENES_COMMANDS_SERVICE_URL", "http://order-command-api:3000")
-        self.timeout = 30.0
+        self.timeout = DEFAULT_TIMEOUT
+        self.client = _CLIENT
     
     def health_check(self) -> Dict[str, Any]:
         try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
+            response = self.client.get(f"{self.base_url}/health", timeout=HEALTH_CHECK_HTTP_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
@@ -28,6 +34,11 @@ class OrdenesCommandsService:
             logger.error(f"Unexpected error checking OrdenesCommands health: {e}")
             raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
 
+@lru_cache
 def get_ordenes_commands_service() -> OrdenesCommandsService:
     return OrdenesCommandsService()
 
+
+def close_client() -> None:
+    """Cierra el cliente HTTP compartido con el microservicio"""
+    _CLIENT.close()
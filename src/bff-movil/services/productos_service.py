@@ -3,20 +3,26 @@ import os
 from typing import Dict, Any, Optional
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, HEALTH_CHECK_HTTP_TIMEOUT, UPSTREAM_LIMITS
 
 logger = logging.getLogger(__name__)
 
+# Cliente compartido por todas las peticiones: reutiliza las conexiones con el microservicio
+_CLIENT = httpx.Client(limits=UPSTREAM_LIMITS, timeout=DEFAULT_TIMEOUT)
+
 
 class ProductosService:
     
     def __init__(self):
         self.base_url = os.getenv("PRODUCTOS_SERVICE_URL", "http://productos-service:3000")
-        self.timeout = 30.0
+        self.timeout = DEFAULT_TIMEOUT
+        self.client = _CLIENT
     
     def health_check(self) -> Dict[str, Any]:
         """Verifica el estado del servicio de productos"""
         try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
+            response = self.client.get(f"{self.base_url}/health", timeout=HEALTH_CHECK_HTTP_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
@@ -60,7 +66,7 @@ class ProductosService:
             if categoria:
                 params["categoria"] = categoria
             
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.base_url}/api/productos/disponibles",
                 params=params,
                 timeout=self.timeout
@@ -94,7 +100,7 @@ class ProductosService:
             Diccionario con la información del producto
         """
         try:
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.base_url}/api/productos/{producto_id}",
                 timeout=self.timeout
             )
@@ -117,7 +123,12 @@ class ProductosService:
             raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
+@lru_cache
 def get_productos_service() -> ProductosService:
     """Dependency para inyectar el servicio de productos"""
     return ProductosService()
 
+
+def close_client() -> None:
+    """Cierra el cliente HTTP compartido con el microservicio"""
+    _CLIENT.close()
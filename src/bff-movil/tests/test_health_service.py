@@ -1,12 +1,34 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from unittest.mock import Mock, patch
+
+import pytest
+
+from services import health_service
 from services.health_service import HealthService
 
+SERVICE_CLASSES = {
+    "autenticacion": "AutenticacionService",
+    "clientes": "ClientesService",
+    "ordenes_commands": "OrdenesCommandsService",
+    "ordenes_queries": "OrdenesQueriesService",
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def service_mocks():
+    """Parchea una sola vez por módulo las clases de servicio con Mock simples, sin spec"""
+    with ExitStack() as stack:
+        yield {
+            name: stack.enter_context(patch.object(health_service, class_name, new_callable=Mock))
+            for name, class_name in SERVICE_CLASSES.items()
+        }
+
 
-@patch('services.health_service.AutenticacionService')
-@patch('services.health_service.ClientesService')
-@patch('services.health_service.OrdenesCommandsService')
-@patch('services.health_service.OrdenesQueriesService')
-def test_overall_health_ok(mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion):
+def test_overall_health_ok(service_mocks):
+    mock_autenticacion, mock_clientes, mock_ordenes_commands, mock_ordenes_queries = service_mocks.values()
     # Mock all services to return healthy
     for mock_service in [mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion]:
         mock_instance = Mock()
@@ -25,11 +47,8 @@ def test_overall_health_ok(mock_ordenes_queries, mock_ordenes_commands, mock_cli
     assert result["services"]["ordenes_queries"]["status"] == "healthy"
 
 
-@patch('services.health_service.AutenticacionService')
-@patch('services.health_service.ClientesService')
-@patch('services.health_service.OrdenesCommandsService')
-@patch('services.health_service.OrdenesQueriesService')
-def test_overall_health_with_details(mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion):
+def test_overall_health_with_details(service_mocks):
+    mock_autenticacion, mock_clientes, mock_ordenes_commands, mock_ordenes_queries = service_mocks.values()
     # Mock services with detailed health information
     mock_autenticacion_instance = Mock()
     mock_autenticacion_instance.health_check.return_value = {"status": "healthy", "version": "1.0"}
@@ -59,11 +78,8 @@ def test_overall_health_with_details(mock_ordenes_queries, mock_ordenes_commands
     assert result["services"]["autenticacion"]["details"]["version"] == "1.0"
 
 
-@patch('services.health_service.AutenticacionService')
-@patch('services.health_service.ClientesService')
-@patch('services.health_service.OrdenesCommandsService')
-@patch('services.health_service.OrdenesQueriesService')
-def test_overall_health_without_details(mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion):
+def test_overall_health_without_details(service_mocks):
+    mock_autenticacion, mock_clientes, mock_ordenes_commands, mock_ordenes_queries = service_mocks.values()
     # Mock all services to return healthy
     for mock_service in [mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion]:
         mock_instance = Mock()
@@ -81,11 +97,8 @@ def test_overall_health_without_details(mock_ordenes_queries, mock_ordenes_comma
     assert "details" not in result["services"]["ordenes_queries"]
 
 
-@patch('services.health_service.AutenticacionService')
-@patch('services.health_service.ClientesService')
-@patch('services.health_service.OrdenesCommandsService')
-@patch('services.health_service.OrdenesQueriesService')
-def test_overall_health_degraded_when_one_service_fails(mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion):
+def test_overall_health_degraded_when_one_service_fails(service_mocks):
+    mock_autenticacion, mock_clientes, mock_ordenes_commands, mock_ordenes_queries = service_mocks.values()
     # Mock autenticacion to fail
     mock_autenticacion_instance = Mock()
     mock_autenticacion_instance.health_check.side_effect = Exception("Connection failed")
@@ -109,11 +122,8 @@ def test_overall_health_degraded_when_one_service_fails(mock_ordenes_queries, mo
     assert result["services"]["ordenes_queries"]["status"] == "healthy"
 
 
-@patch('services.health_service.AutenticacionService')
-@patch('services.health_service.ClientesService')
-@patch('services.health_service.OrdenesCommandsService')
-@patch('services.health_service.OrdenesQueriesService')
-def test_overall_health_degraded_when_multiple_services_fail(mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion):
+def test_overall_health_degraded_when_multiple_services_fail(service_mocks):
+    mock_autenticacion, mock_clientes, mock_ordenes_commands, mock_ordenes_queries = service_mocks.values()
     # Mock autenticacion and clientes to fail
     mock_autenticacion_instance = Mock()
     mock_autenticacion_instance.health_check.side_effect = Exception("Autenticacion error")
@@ -139,11 +149,8 @@ def test_overall_health_degraded_when_multiple_services_fail(mock_ordenes_querie
     assert result["services"]["ordenes_queries"]["status"] == "healthy"
 
 
-@patch('services.health_service.AutenticacionService')
-@patch('services.health_service.ClientesService')
-@patch('services.health_service.OrdenesCommandsService')
-@patch('services.health_service.OrdenesQueriesService')
-def test_overall_health_all_services_fail(mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion):
+def test_overall_health_all_services_fail(service_mocks):
+    mock_autenticacion, mock_clientes, mock_ordenes_commands, mock_ordenes_queries = service_mocks.values()
     # Mock all services to fail
     for mock_service in [mock_ordenes_queries, mock_ordenes_commands, mock_clientes, mock_autenticacion]:
         mock_instance = Mock()
@@ -158,3 +165,67 @@ def test_overall_health_all_services_fail(mock_ordenes_queries, mock_ordenes_com
     assert result["services"]["clientes"]["status"] == "unhealthy"
     assert result["services"]["ordenes_commands"]["status"] == "unhealthy"
     assert result["services"]["ordenes_queries"]["status"] == "unhealthy"
+
+
+def test_overall_health_degraded_when_service_times_out(service_mocks, monkeypatch):
+    """Test para marcar como caído un servicio que no responde dentro del timeout"""
+    monkeypatch.setattr(health_service, "HEALTH_CHECK_TIMEOUT", 0.01)
+    release = threading.Event()
+    for name, mock_service in service_mocks.items():
+        mock_instance = Mock()
+        mock_instance.health_check.return_value = {"status": "healthy"}
+        mock_service.return_value = mock_instance
+    service_mocks["clientes"].return_value.health_check.side_effect = lambda: release.wait()
+
+    service = HealthService()
+    try:
+        result = service.check_overall_health()
+    finally:
+        release.set()
+
+    assert result["status"] == "degraded"
+    assert result["services"]["clientes"]["status"] == "unhealthy"
+    assert "timed out" in result["services"]["clientes"]["error"]
+    assert result["services"]["autenticacion"]["status"] == "healthy"
+
+
+def test_overall_health_uses_single_deadline_for_all_services(service_mocks, monkeypatch):
+    """Test para esperar un único plazo aunque varios servicios no respondan"""
+    monkeypatch.setattr(health_service, "HEALTH_CHECK_TIMEOUT", 0.2)
+    release = threading.Event()
+    for name, mock_service in service_mocks.items():
+        mock_instance = Mock()
+        mock_instance.health_check.side_effect = lambda: release.wait()
+        mock_service.return_value = mock_instance
+
+    service = HealthService()
+    start = time.monotonic()
+    try:
+        result = service.check_overall_health()
+    finally:
+        release.set()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.4
+    assert result["status"] == "degraded"
+    assert all(status["status"] == "unhealthy" for status in result["services"].values())
+
+
+def test_overlapping_health_checks_do_not_share_deadline(service_mocks, monkeypatch):
+    """Test para que dos consultas simultáneas no se encolen una detrás de la otra"""
+    monkeypatch.setattr(health_service, "HEALTH_CHECK_TIMEOUT", 0.5)
+
+    def slow_health_check():
+        time.sleep(0.3)
+        return {"status": "healthy"}
+
+    for mock_service in service_mocks.values():
+        mock_instance = Mock()
+        mock_instance.health_check.side_effect = slow_health_check
+        mock_service.return_value = mock_instance
+
+    service = HealthService()
+    with ThreadPoolExecutor(max_workers=2) as callers:
+        results = list(callers.map(lambda _: service.check_overall_health(), range(2)))
+
+    assert all(result["status"] == "healthy" for result in results)
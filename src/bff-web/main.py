@@ -15,9 +15,14 @@ from router.productos import productos_router
 from router.proveedores import proveedor_router
 from router.reportes import reportes_router
 from router.ventas import ventas_router
+from services import http_client, redis_cache
+from contextlib import asynccontextmanager
 import logging
+import os
 
-logging.basicConfig(level=logging.DEBUG, force=True)
+# Única configuración de logging del proceso (los routers solo obtienen su logger). En DEBUG se
+# emitiría el detalle por petición de httpx/httpcore, por eso el nivel por defecto es INFO
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), force=True)
 logger = logging.getLogger(__name__)
 
 
@@ -30,12 +35,20 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
         if response.status_code in (301, 302, 303, 307, 308):
             location = response.headers.get("location", "")
             if location.startswith("http://"):
-                logger.info(f"Rewriting redirect from HTTP to HTTPS: {location}")
+                logger.info("Rewriting redirect from HTTP to HTTPS: %s", location)
                 response.headers["location"] = location.replace("http://", "https://", 1)
         
         return response
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Al apagar se cierran los clientes compartidos con los microservicios y con Redis
+    await http_client.close_upstream_clients()
+    await redis_cache.close_client()
+
+
 app = FastAPI(
     title="MediSupply - BFF Web",
     description="Backend for Frontend - API Gateway para MediSupply Web",
@@ -43,10 +56,12 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     root_path="/web",
-    redirect_slashes=False  # Disable automatic slash redirects
+    redirect_slashes=False,  # Disable automatic slash redirects
+    lifespan=lifespan
 )
 
 app.add_middleware(HTTPSRedirectMiddleware)
+app.add_middleware(http_client.RequestCacheMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -72,12 +87,13 @@ app.include_router(proveedor_router, prefix="/proveedores", tags=["proveedores"]
 app.include_router(reportes_router, prefix="/reportes", tags=["reportes"])
 app.include_router(ventas_router, prefix="/ventas", tags=["ventas"])
 
+
 @app.get("/health")
-def health_check(
+async def health_check(
     details: bool = False,
     health_service: HealthService = Depends(get_health_service)
 ):
-    health_status = health_service.check_overall_health(include_details=details)
+    health_status = await health_service.check_overall_health(include_details=details)
     
     return health_status
 
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 import logging
 
 from services.auditoria_service import AuditoriaService, get_auditoria_service
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 auditoria_router = APIRouter()
 
 @auditoria_router.get("/health")
-def health_check(auditoria_service: AuditoriaService = Depends(get_auditoria_service)):
-    return auditoria_service.health_check()
+async def health_check(auditoria_service: AuditoriaService = Depends(get_auditoria_service)):
+    ok, detail = await auditoria_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
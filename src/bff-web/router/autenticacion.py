@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
 from services.autenticacion_service import AutenticacionService, get_autenticacion_service
 from schemas.auth_schema import RegisterRequest, LoginRequest, TokenResponse, UserResponse
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 autenticacion_router = APIRouter()
@@ -15,8 +14,11 @@ security = HTTPBearer()
 
 
 @autenticacion_router.get("/health")
-def health_check(autenticacion_service: AutenticacionService = Depends(get_autenticacion_service)):
-    return autenticacion_service.health_check()
+async def health_check(autenticacion_service: AutenticacionService = Depends(get_autenticacion_service)):
+    ok, detail = await autenticacion_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
 
 @autenticacion_router.post(
@@ -26,7 +28,7 @@ def health_check(autenticacion_service: AutenticacionService = Depends(get_auten
     summary="Registrar nuevo usuario",
     description="Registra un nuevo usuario en el sistema con email, nombre de usuario y contraseña"
 )
-def register(
+async def register(
     register_data: RegisterRequest,
     autenticacion_service: AutenticacionService = Depends(get_autenticacion_service)
 ):
@@ -43,7 +45,7 @@ def register(
     Raises:
         HTTPException 400: Si el email ya está registrado
     """
-    return autenticacion_service.register_user(register_data.model_dump())
+    return await autenticacion_service.register_user(register_data.model_dump())
 
 
 @autenticacion_router.post(
@@ -53,7 +55,7 @@ def register(
     summary="Iniciar sesión",
     description="Autentica un usuario y devuelve un token JWT de acceso"
 )
-def login(
+async def login(
     login_data: LoginRequest,
     autenticacion_service: AutenticacionService = Depends(get_autenticacion_service)
 ):
@@ -71,7 +73,7 @@ def login(
         HTTPException 401: Si las credenciales son inválidas
         HTTPException 403: Si el usuario está inactivo
     """
-    return autenticacion_service.login_user(login_data.model_dump())
+    return await autenticacion_service.login_user(login_data.model_dump())
 
 
 @autenticacion_router.get(
@@ -81,7 +83,7 @@ def login(
     summary="Obtener usuario actual",
     description="Obtiene la información del usuario autenticado mediante el token JWT"
 )
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     autenticacion_service: AutenticacionService = Depends(get_autenticacion_service)
 ):
@@ -103,5 +105,5 @@ def get_current_user(
         HTTPException 403: Si el usuario está inactivo
     """
     token = credentials.credentials
-    return autenticacion_service.get_current_user(token)
+    return await autenticacion_service.get_current_user(token)
 
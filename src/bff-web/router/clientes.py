@@ -4,21 +4,23 @@ import logging
 
 from services.clientes_service import ClientesService, get_clientes_service
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 clientes_router = APIRouter()
 
 @clientes_router.get("/health")
-def health_check(clientes_service: ClientesService = Depends(get_clientes_service)):
-    return clientes_service.health_check()
+async def health_check(clientes_service: ClientesService = Depends(get_clientes_service)):
+    ok, detail = await clientes_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
 @clientes_router.get(
     "/asignados",
     summary="Obtener clientes asignados al vendedor autenticado",
     description="Retorna la lista de clientes institucionales asignados al vendedor autenticado"
 )
-def get_clientes_asignados(
+async def get_clientes_asignados(
     clientes_service: ClientesService = Depends(get_clientes_service),
     authorization: str = Header(..., alias="Authorization")
 ):
@@ -26,16 +28,16 @@ def get_clientes_asignados(
         logger.info("BFF: Solicitud de clientes asignados recibida")
         
         # Reenviar la solicitud al servicio de clientes
-        result = clientes_service.get_clientes_asignados(authorization)
+        result = await clientes_service.get_clientes_asignados(authorization)
         
-        logger.info(f"BFF: Retornando {result.get('total', 0)} clientes asignados")
+        logger.info("BFF: Retornando %s clientes asignados", result.get("total", 0))
         return result
         
     except HTTPException:
         # Re-lanzar excepciones HTTP del servicio
         raise
     except Exception as e:
-        logger.error(f"BFF: Error interno al procesar solicitud de clientes asignados: {str(e)}")
+        logger.error("BFF: Error interno al procesar solicitud de clientes asignados: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Error interno del servidor BFF"
@@ -46,25 +48,25 @@ def get_clientes_asignados(
     summary="Obtener un cliente específico asignado al vendedor",
     description="Retorna un cliente específico si está asignado al vendedor autenticado"
 )
-def get_cliente_asignado(
+async def get_cliente_asignado(
     cliente_id: str,
     clientes_service: ClientesService = Depends(get_clientes_service),
     authorization: str = Header(..., alias="Authorization")
 ):
     try:
-        logger.info(f"BFF: Solicitud de cliente {cliente_id} recibida")
+        logger.info("BFF: Solicitud de cliente %s recibida", cliente_id)
         
         # Reenviar la solicitud al servicio de clientes
-        result = clientes_service.get_cliente_asignado(cliente_id, authorization)
+        result = await clientes_service.get_cliente_asignado(cliente_id, authorization)
         
-        logger.info(f"BFF: Cliente {cliente_id} encontrado y retornado")
+        logger.info("BFF: Cliente %s encontrado y retornado", cliente_id)
         return result
         
     except HTTPException:
         # Re-lanzar excepciones HTTP del servicio
         raise
     except Exception as e:
-        logger.error(f"BFF: Error interno al procesar solicitud de cliente {cliente_id}: {str(e)}")
+        logger.error("BFF: Error interno al procesar solicitud de cliente %s: %s", cliente_id, e)
         raise HTTPException(
             status_code=500,
             detail="Error interno del servidor BFF"
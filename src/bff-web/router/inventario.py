@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 import logging
 
 from services.inventario_service import InventarioService, get_inventario_service
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 inventario_router = APIRouter()
 
 @inventario_router.get("/health")
-def health_check(inventario_service: InventarioService = Depends(get_inventario_service)):
-    return inventario_service.health_check()
+async def health_check(inventario_service: InventarioService = Depends(get_inventario_service)):
+    ok, detail = await inventario_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
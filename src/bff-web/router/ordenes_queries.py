@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 import logging
 
 from services.ordenes_queries_service import OrdenesQueriesService, get_ordenes_queries_service
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 ordenes_queries_router = APIRouter()
 
 @ordenes_queries_router.get("/health")
-def health_check(ordenes_queries_service: OrdenesQueriesService = Depends(get_ordenes_queries_service)):
-    return ordenes_queries_service.health_check()
+async def health_check(ordenes_queries_service: OrdenesQueriesService = Depends(get_ordenes_queries_service)):
+    ok, detail = await ordenes_queries_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
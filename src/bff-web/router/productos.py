@@ -1,18 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
 from typing import Optional
 import logging
 
 from services.productos_service import ProductosService, get_productos_service
 from schemas.producto_schema import CrearProductoSchema
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 productos_router = APIRouter()
 
 @productos_router.get("/health")
-def health_check(productos_service: ProductosService = Depends(get_productos_service)):
-    return productos_service.health_check()
+async def health_check(productos_service: ProductosService = Depends(get_productos_service)):
+    ok, detail = await productos_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
 @productos_router.post(
     "/",
@@ -42,17 +44,17 @@ async def crear_producto(
     - **proveedor_id**: ID del proveedor (obligatorio, UUID)
     """
     try:
-        logger.info(f"BFF Web: Solicitud de creación de producto - nombre: {producto.nombre}")
+        logger.info("BFF Web: Solicitud de creación de producto - nombre: %s", producto.nombre)
         
         result = await productos_service.crear_producto(producto.model_dump(mode='json'))
         
-        logger.info(f"BFF Web: Producto creado exitosamente - ID: {result.get('id')}")
+        logger.info("BFF Web: Producto creado exitosamente - ID: %s", result.get("id"))
         return result
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"BFF Web: Error interno al procesar solicitud de creación de producto: {str(e)}")
+        logger.error("BFF Web: Error interno al procesar solicitud de creación de producto: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Error interno del servidor BFF web"
@@ -65,7 +67,7 @@ async def crear_producto(
     summary="Consultar productos con stock disponible",
 
 )
-def get_productos_disponibles(
+async def get_productos_disponibles(
     solo_con_stock: bool = Query(
         True,
         description="Si es True, solo retorna productos con stock mayor a 0"
@@ -81,24 +83,26 @@ def get_productos_disponibles(
 
     try:
         logger.info(
-            f"BFF Móvil: Solicitud de productos disponibles - "
-            f"solo_con_stock: {solo_con_stock}, categoria: {categoria}"
+            "BFF Móvil: Solicitud de productos disponibles - solo_con_stock: %s, categoria: %s",
+            solo_con_stock,
+            categoria
         )
         
-        result = productos_service.get_productos_disponibles(
+        result = await productos_service.get_productos_disponibles(
             solo_con_stock=solo_con_stock,
             categoria=categoria,
             page=page,
             page_size=page_size
         )
         
-        logger.info(f"BFF Móvil: Retornando {result.get('total', 0)} productos disponibles")
-        return result
+        logger.info("BFF Móvil: Retornando productos disponibles")
+        # El listado se reenvía tal como lo entrega el servicio de productos
+        return Response(content=result, media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"BFF Móvil: Error interno al procesar solicitud de productos disponibles: {str(e)}")
+        logger.error("BFF Móvil: Error interno al procesar solicitud de productos disponibles: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Error interno del servidor BFF móvil"
@@ -110,23 +114,23 @@ def get_productos_disponibles(
     summary="Obtener detalle de un producto específico",
     description="Retorna la información completa de un producto por su ID"
 )
-def get_producto(
+async def get_producto(
     producto_id: str = Path(..., description="ID del producto a consultar"),
     productos_service: ProductosService = Depends(get_productos_service)
 ):
 
     try:
-        logger.info(f"BFF Móvil: Solicitud de producto {producto_id} recibida")
+        logger.info("BFF Móvil: Solicitud de producto %s recibida", producto_id)
         
-        result = productos_service.get_producto_by_id(producto_id)
+        result = await productos_service.get_producto_by_id(producto_id)
         
-        logger.info(f"BFF Móvil: Producto {producto_id} encontrado y retornado")
+        logger.info("BFF Móvil: Producto %s encontrado y retornado", producto_id)
         return result
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"BFF Móvil: Error interno al procesar solicitud de producto {producto_id}: {str(e)}")
+        logger.error("BFF Móvil: Error interno al procesar solicitud de producto %s: %s", producto_id, e)
         raise HTTPException(
             status_code=500,
             detail="Error interno del servidor BFF móvil"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, status, HTTPException, Response
 from typing import Optional
 import logging
 
@@ -10,13 +10,15 @@ from schemas.proveedor_schema import (
     TipoProveedorEnum
 )
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 proveedor_router = APIRouter()
 @proveedor_router.get("/health")
-def health_check(proveedores_service: ProveedoresService = Depends(get_proveedores_service)):
-    return proveedores_service.health_check()
+async def health_check(proveedores_service: ProveedoresService = Depends(get_proveedores_service)):
+    ok, detail = await proveedores_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
 @proveedor_router.post(
     "/",
@@ -60,8 +62,8 @@ async def crear_proveedor(
     - **contacto**: Información de contacto (opcional, máximo 255 caracteres)
     - **condiciones_entrega**: Condiciones de entrega (opcional, máximo 500 caracteres)
     """
-    data = await proveedores_service.crear_proveedor(proveedor.model_dump())
-    return data
+    content = await proveedores_service.crear_proveedor(proveedor.model_dump())
+    return Response(content=content, status_code=status.HTTP_201_CREATED, media_type="application/json")
 
 
 @proveedor_router.get(
@@ -111,14 +113,15 @@ async def listar_proveedores(
     pais_value = pais.value if pais else None
     tipo_value = tipo_proveedor.value if tipo_proveedor else None
     
-    data = await proveedores_service.listar_proveedores(
+    content = await proveedores_service.listar_proveedores(
         pais=pais_value,
         tipo_proveedor=tipo_value,
         page=page,
         page_size=page_size
     )
     
-    return data
+    # El listado se reenvía tal como lo entrega el servicio de proveedores
+    return Response(content=content, media_type="application/json")
 
 
 @proveedor_router.get(
@@ -166,11 +169,11 @@ async def actualizar_proveedor(
     - No se puede cambiar el ID tributario ni el país
     - El email debe ser único si se actualiza
     """
-    data = await proveedores_service.actualizar_proveedor(
+    content = await proveedores_service.actualizar_proveedor(
         proveedor_id,
         proveedor.model_dump(exclude_unset=True)
     )
-    return data
+    return Response(content=content, media_type="application/json")
 
 
 @proveedor_router.delete(
@@ -193,5 +196,5 @@ async def eliminar_proveedor(
     
     **Precaución**: Esta operación no se puede deshacer.
     """
-    result = await proveedores_service.eliminar_proveedor(proveedor_id)
-    return result
\ No newline at end of file
+    content = await proveedores_service.eliminar_proveedor(proveedor_id)
+    return Response(content=content, media_type="application/json")
\ No newline at end of file
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 import logging
 
 from services.reportes_service import ReportesService, get_reportes_service
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 reportes_router = APIRouter()
 
 @reportes_router.get("/health")
-def health_check(reportes_service: ReportesService = Depends(get_reportes_service)):
-    return reportes_service.health_check()
+async def health_check(reportes_service: ReportesService = Depends(get_reportes_service)):
+    ok, detail = await reportes_service.health_check()
+    if not ok:
+        raise HTTPException(status_code=503, detail=detail)
+    return detail
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from typing import Optional
 import logging
 
@@ -9,7 +9,6 @@ from schemas.vendedor_schema import (
     ZonaAsignadaEnum
 )
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 vendedor_router = APIRouter()
@@ -56,8 +55,8 @@ async def crear_vendedor(
     - **plan_venta**: ID del plan de venta (opcional)
     - **meta_venta**: Meta de ventas en monto monetario (opcional)
     """
-    data = await vendedores_service.crear_vendedor(vendedor.model_dump())
-    return data
+    content = await vendedores_service.crear_vendedor(vendedor.model_dump())
+    return Response(content=content, status_code=status.HTTP_201_CREATED, media_type="application/json")
 
 
 @vendedor_router.get(
@@ -101,12 +100,12 @@ async def listar_vendedores(
     - **Paginación**: Con page (número de página) y page_size (tamaño)
     - **Ordenamiento**: Por fecha de creación (más recientes primero)
     """
-    data = await vendedores_service.listar_vendedores(
+    content = await vendedores_service.listar_vendedores(
         page=page,
         page_size=page_size
     )
 
-    return data
+    return Response(content=content, media_type="application/json")
 
 
 @vendedor_router.get(
@@ -126,8 +125,8 @@ async def obtener_vendedor(
     """
     Obtiene toda la información de un vendedor específico por su ID.
     """
-    data = await vendedores_service.obtener_vendedor(vendedor_id)
-    return data
+    content = await vendedores_service.obtener_vendedor(vendedor_id)
+    return Response(content=content, media_type="application/json")
 
 
 @vendedor_router.put(
@@ -154,8 +153,8 @@ async def actualizar_vendedor(
     - El documento de identidad no se puede cambiar
     - El email debe ser único si se actualiza
     """
-    data = await vendedores_service.actualizar_vendedor(
+    content = await vendedores_service.actualizar_vendedor(
         vendedor_id,
         vendedor.model_dump(exclude_unset=True)
     )
-    return data
+    return Response(content=content, media_type="application/json")
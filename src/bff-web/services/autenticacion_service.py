@@ -1,34 +1,33 @@
 import httpx
-import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, UpstreamClient, request_with_retries
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+AUTENTICACION_SERVICE_URL = SETTINGS.autenticacion_service_url
+_TIMEOUT = DEFAULT_TIMEOUT
+
+_UPSTREAM = UpstreamClient("Autenticacion", AUTENTICACION_SERVICE_URL, timeout=_TIMEOUT)
+
 
 class AutenticacionService:
 
     def __init__(self):
-        self.base_url = os.getenv("AUTENTICACION_SERVICE_URL", "http://autenticacion-service:3000")
-        self.timeout = 30.0
+        self.base_url = AUTENTICACION_SERVICE_URL
+        self.timeout = _TIMEOUT
+        self.upstream = _UPSTREAM
 
-    def health_check(self) -> Dict[str, Any]:
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Autenticacion microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Autenticacion service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Autenticacion microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Autenticacion service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Autenticacion health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.upstream.breaker.call(request_with_retries, self.upstream.client, method, url, **kwargs)
+
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=self.timeout)
 
-    def register_user(self, register_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def register_user(self, register_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Registra un nuevo usuario en el sistema
 
@@ -42,8 +41,8 @@ class AutenticacionService:
             HTTPException: Si hay un error en el registro
         """
         try:
-            response = httpx.post(
-                f"{self.base_url}/auth/register",
+            response = await self.upstream.post(
+                "/auth/register",
                 json=register_data,
                 timeout=self.timeout
             )
@@ -61,7 +60,7 @@ class AutenticacionService:
             logger.error(f"Unexpected error during registration: {e}")
             raise HTTPException(status_code=500, detail=f"Error inesperado: {e}")
 
-    def login_user(self, login_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def login_user(self, login_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Autentica un usuario y devuelve un token JWT
 
@@ -75,8 +74,8 @@ class AutenticacionService:
             HTTPException: Si las credenciales son inválidas
         """
         try:
-            response = httpx.post(
-                f"{self.base_url}/auth/login",
+            response = await self.upstream.post(
+                "/auth/login",
                 json=login_data,
                 timeout=self.timeout
             )
@@ -94,7 +93,7 @@ class AutenticacionService:
             logger.error(f"Unexpected error during login: {e}")
             raise HTTPException(status_code=500, detail=f"Error inesperado: {e}")
 
-    def get_current_user(self, token: str) -> Dict[str, Any]:
+    async def get_current_user(self, token: str) -> Dict[str, Any]:
         """
         Obtiene la información del usuario actual mediante su token JWT
 
@@ -108,8 +107,9 @@ class AutenticacionService:
             HTTPException: Si el token es inválido o expiró
         """
         try:
-            response = httpx.get(
-                f"{self.base_url}/auth/me",
+            response = await self._request(
+                "GET",
+                "/auth/me",
                 headers={"Authorization": f"Bearer {token}"},
                 timeout=self.timeout
             )
@@ -127,6 +127,7 @@ class AutenticacionService:
             logger.error(f"Unexpected error getting current user: {e}")
             raise HTTPException(status_code=500, detail=f"Error inesperado: {e}")
 
+@lru_cache
 def get_autenticacion_service() -> AutenticacionService:
     return AutenticacionService()
 
@@ -1,48 +1,48 @@
 import httpx
-import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, UpstreamClient, request_with_retries
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+CLIENTES_SERVICE_URL = SETTINGS.clientes_service_url
+_TIMEOUT = DEFAULT_TIMEOUT
+
+_UPSTREAM = UpstreamClient("Clientes", CLIENTES_SERVICE_URL, timeout=_TIMEOUT)
+
 
 class ClientesService:
     
     def __init__(self):
-        self.base_url = os.getenv("CLIENTES_SERVICE_URL", "http://clientes-service:3000")
-        self.timeout = 30.0
+        self.base_url = CLIENTES_SERVICE_URL
+        self.timeout = _TIMEOUT
+        self.upstream = _UPSTREAM
     
-    def health_check(self) -> Dict[str, Any]:
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Clientes microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Clientes service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Clientes microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Clientes service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Clientes health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.upstream.breaker.call(request_with_retries, self.upstream.client, method, url, **kwargs)
+
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=self.timeout)
 
-    def get_clientes_asignados(self, authorization_header: str) -> Dict[str, Any]:
+    async def get_clientes_asignados(self, authorization_header: str) -> Dict[str, Any]:
         try:
             headers = {
                 "Authorization": authorization_header,
                 "Content-Type": "application/json"
             }
             
-            response = httpx.get(
-                f"{self.base_url}/api/clientes/asignados",
+            response = await self._request(
+                "GET",
+                "/api/clientes/asignados",
                 headers=headers,
                 timeout=self.timeout
             )
             response.raise_for_status()
             
-            logger.info(f"Successfully retrieved clientes asignados from service")
+            logger.info("Successfully retrieved clientes asignados from service")
             return response.json()
             
         except httpx.HTTPStatusError as e:
@@ -60,21 +60,22 @@ class ClientesService:
             logger.error(f"Unexpected error getting clientes asignados: {e}")
             raise HTTPException(status_code=500, detail="Error interno del servidor")
 
-    def get_cliente_asignado(self, cliente_id: str, authorization_header: str) -> Dict[str, Any]:
+    async def get_cliente_asignado(self, cliente_id: str, authorization_header: str) -> Dict[str, Any]:
         try:
             headers = {
                 "Authorization": authorization_header,
                 "Content-Type": "application/json"
             }
             
-            response = httpx.get(
-                f"{self.base_url}/api/clientes/asignados/{cliente_id}",
+            response = await self._request(
+                "GET",
+                f"/api/clientes/asignados/{cliente_id}",
                 headers=headers,
                 timeout=self.timeout
             )
             response.raise_for_status()
             
-            logger.info(f"Successfully retrieved cliente {cliente_id} from service")
+            logger.info("Successfully retrieved cliente %s from service", cliente_id)
             return response.json()
             
         except httpx.HTTPStatusError as e:
@@ -92,6 +93,7 @@ class ClientesService:
             logger.error(f"Unexpected error getting cliente {cliente_id}: {e}")
             raise HTTPException(status_code=500, detail="Error interno del servidor")
 
+@lru_cache
 def get_clientes_service() -> ClientesService:
     return ClientesService()
 
@@ -1,5 +1,8 @@
-from typing import Dict, Any
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
 import logging
+from functools import lru_cache
 from .auditoria_service import AuditoriaService
 from .autenticacion_service import AutenticacionService
 from .clientes_service import ClientesService
@@ -14,6 +17,9 @@ from .ventas_service import VentasService
 
 logger = logging.getLogger(__name__)
 
+# Segundos durante los que se reutiliza un resultado healthy: los probes no disparan 11 llamadas cada vez
+HEALTH_CACHE_TTL = 2.0
+
 
 class HealthService:
 
@@ -31,33 +37,70 @@ class HealthService:
             "reportes": ReportesService(),
             "ventas": VentasService()
         }
+        self._cache: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = asyncio.Lock()
+
+    async def check_overall_health(self, include_details: bool = False) -> Dict[str, Any]:
+        cached = self._cached_health(include_details)
+        if cached is not None:
+            return cached
+
+        async with self._lock:
+            # Otro probe pudo haber refrescado el resultado mientras se esperaba el lock
+            cached = self._cached_health(include_details)
+            if cached is not None:
+                return cached
+
+            health_status = await self._collect_health(include_details)
+            if health_status["status"] == "healthy":
+                self._cache[include_details] = (time.monotonic(), health_status)
+            else:
+                self._cache.pop(include_details, None)
+            return health_status
+
+    def _cached_health(self, include_details: bool) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(include_details)
+        if entry is not None and time.monotonic() - entry[0] < HEALTH_CACHE_TTL:
+            return entry[1]
+        return None
 
-    def check_overall_health(self, include_details: bool = False) -> Dict[str, Any]:
+    async def _collect_health(self, include_details: bool) -> Dict[str, Any]:
         
         health_status = {
             "status": "healthy",
             "services": {}
         }
-        
-        for service_name, service_instance in self.services.items():
-            try:
-                service_health = service_instance.health_check()
+
+        # Los health checks se consultan en paralelo: la latencia total es la del más lento
+        results = await asyncio.gather(
+            *(service.health_check() for service in self.services.values()),
+            return_exceptions=True
+        )
+
+        for service_name, result in zip(self.services, results):
+            if isinstance(result, BaseException):
+                ok, service_health = False, f"Unexpected error: {result}"
+            else:
+                ok, service_health = result
+
+            if ok:
                 service_status = {"status": "healthy"}
                 
                 if include_details:
                     service_status["details"] = service_health
                     
                 health_status["services"][service_name] = service_status
-            except Exception as e:
-                logger.error(f"{service_name} service health check failed: {e}")
+            else:
+                logger.error(f"{service_name} service health check failed: {service_health}")
                 health_status["services"][service_name] = {
                     "status": "unhealthy",
-                    "error": str(e)
+                    "error": str(service_health)
                 }
                 health_status["status"] = "degraded"
         
         return health_status
     
+@lru_cache
 def get_health_service() -> HealthService:
     """Dependency function to get health service instance"""
     return HealthService()
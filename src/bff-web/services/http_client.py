@@ -0,0 +1,550 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import random
+import socket
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, List, NoReturn, Optional, Set, Tuple, Union
+
+import httpx
+import orjson
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+JSON_HEADERS = {"Content-Type": "application/json"}
+BREAKER_FAILURE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+UPSTREAM_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+
+# Timeout por defecto hacia los microservicios: un peer caído falla a los 2s al
+# conectar en vez de consumir 30s, y la lectura conserva margen para respuestas lentas
+DEFAULT_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=5.0, pool=1.0)
+
+# TCP_NODELAY evita la espera de Nagle en cuerpos pequeños; el keepalive del SO
+# detecta antes los peers caídos en conexiones del pool
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+    ]
+
+# Referencias a las tareas en background para que no sean recolectadas antes de terminar
+_BACKGROUND_TASKS: Set[asyncio.Task] = set()
+
+# Resultados memoizados durante la petición entrante actual (ver RequestCacheMiddleware)
+_REQUEST_CACHE: contextvars.ContextVar[Optional[Dict[Hashable, asyncio.Future]]] = contextvars.ContextVar(
+    "request_cache", default=None
+)
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Se lanza sin contactar al upstream mientras su circuito está abierto"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por upstream
+
+    Tras fail_max fallas consecutivas (errores de conexión o respuestas 5xx)
+    el circuito se abre y las peticiones fallan de inmediato durante
+    reset_timeout segundos. Pasado ese tiempo entra en half-open: solo la
+    primera petición pasa como prueba y las demás siguen fallando de
+    inmediato mientras está en curso. Si la prueba responde bien el
+    circuito se cierra, si falla se reabre.
+    """
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        if self._opened_at is None:
+            return False
+        return self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None:
+            # Falló la prueba half-open (o una petición iniciada antes de abrir): nuevo cool-off
+            self._opened_at = time.monotonic()
+        elif self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+            logger.warning("Circuit opened for %s service after %s failures", self.name, self._failures)
+
+    async def call(self, func: Callable[..., Awaitable[httpx.Response]], *args: Any, **kwargs: Any) -> httpx.Response:
+        trial = False
+        if self._opened_at is not None:
+            if self.is_open:
+                raise CircuitOpenError(f"Circuit open for {self.name} service")
+            # Cool-off cumplido: esta petición es la única prueba half-open
+            self._trial_in_flight = trial = True
+
+        try:
+            response = await func(*args, **kwargs)
+        except httpx.RequestError:
+            self.record_failure()
+            raise
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+        if response.status_code in BREAKER_FAILURE_STATUS_CODES:
+            self.record_failure()
+        else:
+            self.record_success()
+        return response
+
+
+class SingleFlight:
+    """
+    Coalescencia de peticiones concurrentes (single-flight)
+
+    La primera llamada con una llave ejecuta la función; las que llegan
+    mientras sigue en curso esperan ese mismo resultado (o excepción) en
+    lugar de repetir la petición al upstream.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            # shield: cancelar a quien espera no debe cancelar la petición compartida
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marca la excepción como consumida aunque no haya nadie esperando
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+class AsyncBatcher:
+    """
+    Agrupa cargas individuales por llave en una sola petición
+
+    Las llaves solicitadas dentro de una ventana corta (o hasta completar
+    max_batch) se envían juntas a fetch_many, que retorna un diccionario
+    llave -> valor. Cada llamador recibe solo su valor, o None si el
+    upstream no lo retornó. Si fetch_many falla, todos reciben el error.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        window: float = 0.005,
+        max_batch: int = 50,
+    ):
+        self._fetch_many = fetch_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def load(self, key: Hashable) -> Any:
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await asyncio.shield(future)
+
+    def _take(self) -> Dict[Hashable, asyncio.Future]:
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _dispatch(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        run_in_background(self._flush(self._take()))
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        await self._flush(self._take())
+
+    async def _flush(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        if not batch:
+            return
+        try:
+            results = await self._fetch_many(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+def sync_transport() -> httpx.HTTPTransport:
+    """Transporte HTTP/2 con el pool y las opciones de socket compartidas"""
+    return httpx.HTTPTransport(http2=True, limits=UPSTREAM_LIMITS, socket_options=SOCKET_OPTIONS)
+
+
+def async_transport() -> httpx.AsyncHTTPTransport:
+    """Versión asíncrona de sync_transport"""
+    return httpx.AsyncHTTPTransport(http2=True, limits=UPSTREAM_LIMITS, socket_options=SOCKET_OPTIONS)
+
+
+# Clientes abiertos, para cerrarlos todos al apagar la aplicación
+_UPSTREAM_CLIENTS: "weakref.WeakSet[UpstreamClient]" = weakref.WeakSet()
+
+
+class UpstreamClient:
+    """
+    Cliente de un microservicio
+
+    Es dueño del AsyncClient con el pool y el transporte compartidos y
+    centraliza el health check, que antes cada servicio repetía con su
+    propio bloque de manejo de errores.
+
+    get/post/put/delete/send pasan por el circuit breaker del upstream: con
+    el circuito abierto fallan de inmediato con CircuitOpenError (un
+    httpx.RequestError) sin abrir conexiones. El health check no pasa por
+    el breaker para reportar siempre el estado real del microservicio.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: Union[float, httpx.Timeout],
+        fail_max: int = 5,
+        reset_timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.name = name
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            transport=transport or async_transport(),
+        )
+        self.breaker = CircuitBreaker(name.lower(), fail_max=fail_max, reset_timeout=reset_timeout)
+        _UPSTREAM_CLIENTS.add(self)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.breaker.call(self.client.get, url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.breaker.call(self.client.post, url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.breaker.call(self.client.put, url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.breaker.call(self.client.delete, url, **kwargs)
+
+    async def send(self, request: httpx.Request) -> httpx.Response:
+        return await self.breaker.call(self.client.send, request)
+
+    async def health(self, timeout: Union[float, httpx.Timeout, None] = None) -> Tuple[bool, Any]:
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        try:
+            response = await self.client.get("/health", **kwargs)
+            response.raise_for_status()
+            return True, orjson.loads(response.content)
+        except httpx.HTTPStatusError as e:
+            logger.error("Health check failed for %s microservice: %s", self.name, e)
+            return False, f"{self.name} service returned error: {e}"
+        except httpx.RequestError as e:
+            logger.error("Failed to connect to %s microservice: %s", self.name, e)
+            return False, f"Cannot reach {self.name} service: {e}"
+        except Exception as e:
+            logger.error("Unexpected error checking %s health: %s", self.name, e)
+            return False, f"Unexpected error: {e}"
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+async def close_upstream_clients() -> None:
+    """Cierra los clientes de todos los microservicios"""
+    for upstream in list(_UPSTREAM_CLIENTS):
+        await upstream.aclose()
+
+
+class RequestCacheMiddleware:
+    """
+    Middleware ASGI que abre un cache vacío por cada petición HTTP entrante
+
+    Dentro de la petición, request_scoped colapsa las llamadas repetidas con la
+    misma llave (p. ej. un mismo proveedor consultado al validar y al armar la
+    respuesta) en una sola ejecución. El cache se descarta al terminar.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _REQUEST_CACHE.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _REQUEST_CACHE.reset(token)
+
+
+async def request_scoped(key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """Ejecuta func una sola vez por llave dentro de la petición actual; fuera de una petición no memoiza"""
+    cache = _REQUEST_CACHE.get()
+    if cache is None:
+        return await func(*args, **kwargs)
+    future = cache.get(key)
+    if future is None:
+        future = cache[key] = asyncio.ensure_future(func(*args, **kwargs))
+    return await asyncio.shield(future)
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Agenda una corrutina en el event loop sin bloquear al llamador"""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return task
+
+
+StatusHandler = Callable[[httpx.Response], Any]
+
+
+def json_body(response: httpx.Response) -> Any:
+    return orjson.loads(response.content)
+
+
+def raw_body(response: httpx.Response) -> bytes:
+    return response.content
+
+
+def raise_with_body(response: httpx.Response) -> NoReturn:
+    """Propaga el error del upstream con su cuerpo JSON como detalle"""
+    raise HTTPException(status_code=response.status_code, detail=orjson.loads(response.content))
+
+
+def raise_detail(status_code: int, detail: str) -> StatusHandler:
+    """Handler que responde siempre con el mismo status y detalle"""
+    def handler(response: httpx.Response) -> NoReturn:
+        raise HTTPException(status_code=status_code, detail=detail)
+    return handler
+
+
+def status_dispatcher(service_name: str, handlers: Dict[int, StatusHandler]) -> StatusHandler:
+    """
+    Resuelve la respuesta de un upstream con una tabla status -> handler
+
+    La tabla se construye una vez al importar el módulo, así cada llamada hace
+    un solo dict.get en vez de recorrer una cadena de if/elif. Los status que
+    no están en la tabla se reportan como error del upstream.
+    """
+    def unexpected_status(response: httpx.Response) -> NoReturn:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Error from {service_name} service: {response.text}"
+        )
+
+    lookup = dict(handlers).get
+
+    def dispatch(response: httpx.Response) -> Any:
+        return lookup(response.status_code, unexpected_status)(response)
+
+    return dispatch
+
+
+def upstream_call(
+    service_name: str,
+    *,
+    not_found_detail: Optional[str] = None,
+    unavailable_detail: Optional[str] = None,
+) -> Callable:
+    """
+    Traduce las fallas del upstream a HTTPException
+
+    - httpx.HTTPStatusError: 404 con not_found_detail (formateado con los
+      argumentos de la llamada) o el mismo código del upstream
+    - httpx.RequestError: 503
+    - Cualquier otro error: 500
+
+    Las HTTPException lanzadas por el método se propagan sin cambios.
+    """
+    unavailable = unavailable_detail or f"No se puede conectar con el servicio de {service_name}"
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        func_logger = logging.getLogger(func.__module__)
+        signature = inspect.signature(func)
+        operation = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException:
+                raise
+            except httpx.HTTPStatusError as e:
+                func_logger.error("HTTP error in %s: %s", operation, e)
+                if e.response.status_code == 404 and not_found_detail:
+                    arguments = signature.bind(*args, **kwargs).arguments
+                    raise HTTPException(status_code=404, detail=not_found_detail.format(**arguments))
+                raise HTTPException(
+                    status_code=e.response.status_code,
+                    detail=f"Error del servicio de {service_name}: {e}"
+                )
+            except httpx.RequestError as e:
+                func_logger.error("Failed to connect to %s microservice in %s: %s", service_name, operation, e)
+                raise HTTPException(status_code=503, detail=unavailable)
+            except Exception as e:
+                func_logger.error("Unexpected error in %s: %s", operation, e)
+                raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+        return wrapper
+
+    return decorator
+
+
+def _is_retryable_method(method: str, headers: Any) -> bool:
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    # Un POST solo se reintenta si el llamador envía una llave de idempotencia
+    return bool(headers) and IDEMPOTENCY_KEY_HEADER in headers
+
+
+def _backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Backoff exponencial acotado con full jitter"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def _cap_timeout(timeout: httpx.Timeout, remaining: float) -> httpx.Timeout:
+    """Limita cada fase del timeout del cliente al tiempo restante del budget"""
+    def cap(value: Optional[float]) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(
+        connect=cap(timeout.connect),
+        read=cap(timeout.read),
+        write=cap(timeout.write),
+        pool=cap(timeout.pool),
+    )
+
+
+def with_params(template: httpx.Request, params: Dict[str, Any]) -> httpx.Request:
+    """Crea una petición a partir de una plantilla pre-construida cambiando solo los query params"""
+    return httpx.Request(
+        template.method,
+        template.url.copy_merge_params(params),
+        headers=template.headers,
+        extensions=dict(template.extensions),
+    )
+
+
+async def request_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    max_retries: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    budget: Optional[float] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Construye la petición una sola vez y la envía con send_with_retries"""
+    request = client.build_request(method, url, **kwargs)
+    return await send_with_retries(
+        client,
+        request,
+        max_retries=max_retries,
+        base_delay=base_delay,
+        max_delay=max_delay,
+        budget=budget,
+    )
+
+
+async def send_with_retries(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    *,
+    max_retries: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    budget: Optional[float] = None,
+) -> httpx.Response:
+    """
+    Envía una petición reintentando fallas transitorias del upstream
+
+    Se reintentan errores de conexión y respuestas 429/5xx transitorias
+    para métodos idempotentes. Si se indica un budget (en segundos), todos
+    los intentos y esperas deben completarse dentro de ese tiempo. Si se
+    agotan los reintentos se retorna la última respuesta o se propaga el
+    último httpx.RequestError.
+    """
+    method, url = request.method, request.url
+    retries = max_retries if _is_retryable_method(method, request.headers) else 0
+    loop = asyncio.get_running_loop()
+    deadline = None if budget is None else loop.time() + budget
+
+    for attempt in range(retries + 1):
+        if deadline is not None:
+            timeout = _cap_timeout(client.timeout, max(deadline - loop.time(), 0.0))
+            request.extensions["timeout"] = timeout.as_dict()
+
+        error = None
+        try:
+            response = await client.send(request)
+        except httpx.RequestError as e:
+            response, error = None, e
+
+        if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+            return response
+
+        delay = _backoff_delay(attempt, base_delay, max_delay)
+        if attempt >= retries or (deadline is not None and loop.time() + delay >= deadline):
+            if error is not None:
+                raise error
+            return response
+
+        reason = error if error is not None else f"status {response.status_code}"
+        logger.warning("Retrying %s %s after %s", method, url, reason)
+        await asyncio.sleep(delay)
@@ -1,33 +1,28 @@
-import httpx
-import os
-from typing import Dict, Any
-from fastapi import HTTPException
+from typing import Dict, Any, Tuple
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, UpstreamClient
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+INVENTARIO_SERVICE_URL = SETTINGS.inventario_service_url
+_TIMEOUT = DEFAULT_TIMEOUT
+
+_UPSTREAM = UpstreamClient("Inventario", INVENTARIO_SERVICE_URL, timeout=_TIMEOUT)
+
 
 class InventarioService:
     
     def __init__(self):
-        self.base_url = os.getenv("INVENTARIO_SERVICE_URL", "http://inventario-service:3000")
-        self.timeout = 30.0
+        self.base_url = INVENTARIO_SERVICE_URL
+        self.timeout = _TIMEOUT
+        self.upstream = _UPSTREAM
     
-    def health_check(self) -> Dict[str, Any]:
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Inventario microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Inventario service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Inventario microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Inventario service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Inventario health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=self.timeout)
 
+@lru_cache
 def get_inventario_service() -> InventarioService:
     return InventarioService()
 
@@ -1,33 +1,34 @@
 import httpx
-import os
-from typing import Dict, Any
-from fastapi import HTTPException
+from typing import Dict, Any, Tuple
 import logging
+from functools import lru_cache
+from .http_client import UpstreamClient
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+LOGISTICA_SERVICE_URL = SETTINGS.logistica_service_url
+_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=1.0)
+
+# Presupuesto de latencia (segundos) por operación, incluyendo reintentos
+HTTP_TIMEOUTS: Dict[str, float] = {
+    "health_check": 1.0,
+}
+
+_UPSTREAM = UpstreamClient("Logistica", LOGISTICA_SERVICE_URL, timeout=_TIMEOUT)
+_ASYNC_CLIENT = _UPSTREAM.client
+
 
 class LogisticaService:
     
     def __init__(self):
-        self.base_url = os.getenv("LOGISTICA_SERVICE_URL", "http://logistica-service:3000")
-        self.timeout = 30.0
+        self.base_url = LOGISTICA_SERVICE_URL
+        self.upstream = _UPSTREAM
+        self.async_client = _ASYNC_CLIENT
     
-    def health_check(self) -> Dict[str, Any]:
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Logistica microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Logistica service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Logistica microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Logistica service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Logistica health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=HTTP_TIMEOUTS["health_check"])
 
+@lru_cache
 def get_logistica_service() -> LogisticaService:
     return LogisticaService()
-
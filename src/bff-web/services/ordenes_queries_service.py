@@ -1,33 +1,28 @@
-import httpx
-import os
-from typing import Dict, Any
-from fastapi import HTTPException
+from typing import Dict, Any, Tuple
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, UpstreamClient
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+ORDENES_QUERIES_SERVICE_URL = SETTINGS.ordenes_queries_service_url
+_TIMEOUT = DEFAULT_TIMEOUT
+
+_UPSTREAM = UpstreamClient("OrdenesQueries", ORDENES_QUERIES_SERVICE_URL, timeout=_TIMEOUT)
+
 
 class OrdenesQueriesService:
     
     def __init__(self):
-        self.base_url = os.getenv("ORDENES_QUERIES_SERVICE_URL", "http://order-query-api:3000")
-        self.timeout = 30.0
+        self.base_url = ORDENES_QUERIES_SERVICE_URL
+        self.timeout = _TIMEOUT
+        self.upstream = _UPSTREAM
     
-    def health_check(self) -> Dict[str, Any]:
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for OrdenesQueries microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"OrdenesQueries service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to OrdenesQueries microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach OrdenesQueries service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking OrdenesQueries health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=self.timeout)
 
+@lru_cache
 def get_ordenes_queries_service() -> OrdenesQueriesService:
     return OrdenesQueriesService()
 
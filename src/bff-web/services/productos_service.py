@@ -1,42 +1,125 @@
 import httpx
-import os
-from typing import Dict, Any, Optional
+import orjson
+from typing import Dict, Any, Optional, Tuple
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from cachetools import TTLCache
+from .http_client import (
+    JSON_HEADERS,
+    SingleFlight,
+    UpstreamClient,
+    request_with_retries,
+    run_in_background,
+    send_with_retries,
+    upstream_call,
+    with_params,
+)
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+PRODUCTOS_SERVICE_URL = SETTINGS.productos_service_url
+_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=1.0)
+
+# Presupuesto de latencia (segundos) por operación, incluyendo reintentos
+HTTP_TIMEOUTS: Dict[str, float] = {
+    "health_check": 1.0,
+    "get_productos_disponibles": 3.0,
+    "get_producto_by_id": 3.0,
+    "crear_producto": 8.0,
+}
+
+_UPSTREAM = UpstreamClient("Productos", PRODUCTOS_SERVICE_URL, timeout=_TIMEOUT)
+_ASYNC_CLIENT = _UPSTREAM.client
+
+_LIST_PATH = "/api/productos/"
+
+# Plantilla pre-construida del listado, solo cambian los query params en cada llamada
+_DISPONIBLES_REQUEST = _ASYNC_CLIENT.build_request("GET", "/api/productos/disponibles")
+
+# Cache de lecturas idempotentes (GET) compartido por todas las instancias
+_GET_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_SINGLE_FLIGHT = SingleFlight()
+
 
 class ProductosService:
     
     def __init__(self):
-        self.base_url = os.getenv("PRODUCTOS_SERVICE_URL", "http://productos-service:3000")
-        self.timeout = 30.0
+        self.base_url = PRODUCTOS_SERVICE_URL
+        self.upstream = _UPSTREAM
+        self.async_client = _ASYNC_CLIENT
+        self.breaker = _UPSTREAM.breaker
+        self._get_cache = _GET_CACHE
+        self._single_flight = _SINGLE_FLIGHT
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.breaker.call(request_with_retries, self.async_client, method, url, **kwargs)
+
+    async def _send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self.breaker.call(send_with_retries, self.async_client, request, **kwargs)
+
+    def _invalidate_listings(self) -> None:
+        """Descarta los listados de productos disponibles cacheados"""
+        for key in [key for key in self._get_cache if key[0] == "disponibles"]:
+            self._get_cache.pop(key, None)
     
-    def health_check(self) -> Dict[str, Any]:
+    async def _fetch_disponibles(
+        self,
+        solo_con_stock: bool,
+        categoria: Optional[str],
+        page: int,
+        page_size: int
+    ) -> bytes:
+        params = {
+            "solo_con_stock": solo_con_stock,
+            "page": page,
+            "page_size": page_size,
+        }
+        if categoria:
+            params["categoria"] = categoria
+
+        response = await self._send(
+            with_params(_DISPONIBLES_REQUEST, params),
+            budget=HTTP_TIMEOUTS["get_productos_disponibles"]
+        )
+        response.raise_for_status()
+
+        self._get_cache[("disponibles", solo_con_stock, categoria, page, page_size)] = response.content
+        return response.content
+
+    async def _prefetch_disponibles(
+        self,
+        content: bytes,
+        solo_con_stock: bool,
+        categoria: Optional[str],
+        page: int,
+        page_size: int
+    ) -> None:
+        """Carga en el cache la página siguiente a `content` sin propagar errores"""
+        if page >= orjson.loads(content).get("total_pages", 0):
+            return
+        page += 1
+        if ("disponibles", solo_con_stock, categoria, page, page_size) in self._get_cache:
+            return
         try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Productos microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Productos service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Productos microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Productos service: {e}")
+            await self._fetch_disponibles(solo_con_stock, categoria, page, page_size)
         except Exception as e:
-            logger.error(f"Unexpected error checking Productos health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+            logger.debug("Prefetch of productos disponibles page %s failed: %s", page, e)
+
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=HTTP_TIMEOUTS["health_check"])
 
     
     
-    def get_productos_disponibles(
+    @upstream_call("productos", not_found_detail="No se encontraron productos disponibles")
+    async def get_productos_disponibles(
         self,
         solo_con_stock: bool = True,
         categoria: Optional[str] = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> Dict[str, Any]:
+    ) -> bytes:
         """
         Obtiene la lista de productos disponibles con stock
         
@@ -47,42 +130,24 @@ class ProductosService:
             page_size: Tamaño de página
             
         Returns:
-            Diccionario con 'total', 'page', 'page_size', 'total_pages' y 'productos'
+            JSON crudo del servicio de productos con 'total', 'page', 'page_size',
+            'total_pages' y 'productos', listo para reenviarse sin re-serializar
         """
-        try:
-            params = {
-                "solo_con_stock": solo_con_stock,
-                "page": page,
-                "page_size": page_size,
-            }
-            
-            if categoria:
-                params["categoria"] = categoria
-            
-            response = httpx.get(
-                f"{self.base_url}/api/productos/disponibles",
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            logger.info(f"Successfully retrieved productos disponibles from service")
-            return response.json()
-            
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error getting productos disponibles: {e}")
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail="No se encontraron productos disponibles")
-            else:
-                raise HTTPException(status_code=e.response.status_code, detail=f"Error del servicio de productos: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Productos microservice: {e}")
-            raise HTTPException(status_code=503, detail="No se puede conectar con el servicio de productos")
-        except Exception as e:
-            logger.error(f"Unexpected error getting productos disponibles: {e}")
-            raise HTTPException(status_code=500, detail="Error interno del servidor")
+        cache_key = ("disponibles", solo_con_stock, categoria, page, page_size)
+        cached = self._get_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for %s", cache_key)
+            return cached
+
+        content = await self._fetch_disponibles(solo_con_stock, categoria, page, page_size)
+        logger.info("Successfully retrieved productos disponibles from service")
+
+        # Precarga la siguiente página mientras el cliente procesa la actual
+        run_in_background(self._prefetch_disponibles(content, solo_con_stock, categoria, page, page_size))
+        return content
     
-    def get_producto_by_id(self, producto_id: str) -> Dict[str, Any]:
+    @upstream_call("productos", not_found_detail="Producto {producto_id} no encontrado")
+    async def get_producto_by_id(self, producto_id: str) -> Dict[str, Any]:
         """
         Obtiene un producto específico por su ID
         
@@ -92,29 +157,24 @@ class ProductosService:
         Returns:
             Diccionario con la información del producto
         """
-        try:
-            response = httpx.get(
-                f"{self.base_url}/api/productos/{producto_id}",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            logger.info(f"Successfully retrieved producto {producto_id} from service")
-            return response.json()
-            
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error getting producto {producto_id}: {e}")
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail=f"Producto {producto_id} no encontrado")
-            else:
-                raise HTTPException(status_code=e.response.status_code, detail=f"Error del servicio de productos: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Productos microservice: {e}")
-            raise HTTPException(status_code=503, detail="No se puede conectar con el servicio de productos")
-        except Exception as e:
-            logger.error(f"Unexpected error getting producto {producto_id}: {e}")
-            raise HTTPException(status_code=500, detail="Error interno del servidor")
+        cache_key = ("producto", producto_id)
+        cached = self._get_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for producto %s", producto_id)
+            return cached
+
+        return await self._single_flight.do(cache_key, self._fetch_producto, producto_id)
+
+    async def _fetch_producto(self, producto_id: str) -> Dict[str, Any]:
+        response = await self._request("GET", f"/api/productos/{producto_id}", budget=HTTP_TIMEOUTS["get_producto_by_id"])
+        response.raise_for_status()
+
+        logger.info("Successfully retrieved producto %s from service", producto_id)
+        data = orjson.loads(response.content)
+        self._get_cache[("producto", producto_id)] = data
+        return data
     
+    @upstream_call("productos")
     async def crear_producto(self, producto_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Crea un nuevo producto en el sistema
@@ -126,21 +186,20 @@ class ProductosService:
             Diccionario con la información del producto creado
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/productos/",
-                    json=producto_data
-                )
-                response.raise_for_status()
-                
-                logger.info(f"Successfully created producto: {producto_data.get('nombre')}")
-                return response.json()
-                
+            response = await self._request(
+                "POST",
+                _LIST_PATH,
+                content=orjson.dumps(producto_data),
+                headers=JSON_HEADERS,
+                budget=HTTP_TIMEOUTS["crear_producto"]
+            )
+            response.raise_for_status()
+
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error creating producto: {e}")
+            logger.error("HTTP error creating producto: %s", e)
             error_detail = "Error al crear producto"
             try:
-                error_data = e.response.json()
+                error_data = orjson.loads(e.response.content)
                 error_detail = error_data.get("detail", error_detail)
             except:
                 pass
@@ -149,14 +208,12 @@ class ProductosService:
                 raise HTTPException(status_code=400, detail=error_detail)
             else:
                 raise HTTPException(status_code=e.response.status_code, detail=f"Error del servicio de productos: {error_detail}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Productos microservice: {e}")
-            raise HTTPException(status_code=503, detail="No se puede conectar con el servicio de productos")
-        except Exception as e:
-            logger.error(f"Unexpected error creating producto: {e}")
-            raise HTTPException(status_code=500, detail="Error interno del servidor")
 
+        logger.info("Successfully created producto: %s", producto_data.get("nombre"))
+        self._invalidate_listings()
+        return orjson.loads(response.content)
 
+
+@lru_cache
 def get_productos_service() -> ProductosService:
     return ProductosService()
-
@@ -1,182 +1,297 @@
 import httpx
-import os
-from typing import Optional, Dict, Any
+import orjson
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from cachetools import TTLCache
+from .http_client import (
+    JSON_HEADERS,
+    AsyncBatcher,
+    UpstreamClient,
+    raise_detail,
+    raise_with_body,
+    raw_body,
+    request_scoped,
+    request_with_retries,
+    run_in_background,
+    send_with_retries,
+    status_dispatcher,
+    upstream_call,
+    with_params,
+)
+from .redis_cache import RedisCache, get_redis_client
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+PROVEEDORES_SERVICE_URL = SETTINGS.proveedores_service_url
+_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=1.0)
+
+# Presupuesto de latencia (segundos) por operación, incluyendo reintentos
+HTTP_TIMEOUTS: Dict[str, float] = {
+    "health_check": 1.0,
+    "crear_proveedor": 8.0,
+    "listar_proveedores": 3.0,
+    "obtener_proveedor": 3.0,
+    "actualizar_proveedor": 8.0,
+    "eliminar_proveedor": 8.0,
+}
+
+_UPSTREAM = UpstreamClient("Proveedores", PROVEEDORES_SERVICE_URL, timeout=_TIMEOUT)
+_ASYNC_CLIENT = _UPSTREAM.client
+
+_LIST_PATH = "/proveedores/"
+
+# Plantilla pre-construida del listado, solo cambian los query params en cada llamada
+_LISTAR_REQUEST = _ASYNC_CLIENT.build_request("GET", _LIST_PATH)
+
+_upstream_call = upstream_call("proveedores", unavailable_detail="Proveedores service is not available")
+
+# Tablas status -> handler de cada operación
+_NOT_FOUND = raise_detail(404, "Proveedor no encontrado")
+_CREAR_STATUS = status_dispatcher("proveedores", {201: raw_body, 409: raise_with_body, 422: raise_with_body})
+_LISTAR_STATUS = status_dispatcher("proveedores", {200: raw_body})
+_ACTUALIZAR_STATUS = status_dispatcher(
+    "proveedores", {200: raw_body, 404: _NOT_FOUND, 409: raise_with_body, 422: raise_with_body}
+)
+_ELIMINAR_STATUS = status_dispatcher("proveedores", {200: raw_body, 404: _NOT_FOUND})
+
+# Cache de lecturas idempotentes (GET) compartido por todas las instancias
+_GET_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
 
 class ProveedoresService:
     """Service for communicating with the Proveedores microservice"""
     
     def __init__(self):
-        self.base_url = os.getenv("PROVEEDORES_SERVICE_URL", "http://proveedores-service:3000")
-        self.timeout = 30.0
+        self.base_url = PROVEEDORES_SERVICE_URL
+        self.upstream = _UPSTREAM
+        self.async_client = _ASYNC_CLIENT
+        self.breaker = _UPSTREAM.breaker
+        self._get_cache = _GET_CACHE
+        # Segundo nivel compartido entre réplicas (ENABLE_PROVEEDORES_CACHE)
+        self.redis_cache = (
+            RedisCache(get_redis_client(), prefix="prov", ttl=60)
+            if SETTINGS.enable_proveedores_cache else None
+        )
+        # Agrupa los obtener_proveedor concurrentes en un GET /proveedores/?ids=...
+        self._batcher = AsyncBatcher(self._fetch_proveedores, window=0.005, max_batch=50)
 
-    def health_check(self) -> Dict[str, Any]:
-        """Check the health of the Proveedores microservice"""
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Proveedores microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Proveedores service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Proveedores microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Proveedores service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Proveedores health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
-
-    async def crear_proveedor(self, proveedor_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new proveedor via the proveedores service"""
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.breaker.call(request_with_retries, self.async_client, method, url, **kwargs)
+
+    async def _send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self.breaker.call(send_with_retries, self.async_client, request, **kwargs)
+
+    @staticmethod
+    def _redis_key(cache_key: Tuple) -> str:
+        return ":".join(str(part) for part in cache_key)
+
+    async def _cached(self, cache_key: Tuple) -> Any:
+        """Busca en el cache local y luego en Redis, retornando None si no está"""
+        cached = self._get_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for %s", cache_key)
+            return cached
+        if self.redis_cache is None:
+            return None
+
+        raw = await self.redis_cache.get(self._redis_key(cache_key))
+        if raw is None:
+            return None
+        logger.debug("Redis cache hit for %s", cache_key)
+        # Los listados se guardan como JSON crudo; los proveedores, decodificados
+        cached = raw if cache_key[0] == "listar" else orjson.loads(raw)
+        self._get_cache[cache_key] = cached
+        return cached
+
+    async def _store(self, entries: Dict[Tuple, Any]) -> None:
+        self._get_cache.update(entries)
+        if self.redis_cache is None:
+            return
+        listados = {self._redis_key(key): value for key, value in entries.items() if key[0] == "listar"}
+        proveedores = {
+            self._redis_key(key): orjson.dumps(value)
+            for key, value in entries.items() if key[0] != "listar"
+        }
+        await self.redis_cache.set_many(listados, tag="listar")
+        await self.redis_cache.set_many(proveedores)
+
+    async def _invalidate(self, proveedor_id: Optional[str] = None) -> None:
+        """Descarta los listados cacheados y, si se indica, el proveedor modificado"""
+        if proveedor_id is not None:
+            cache_key = ("proveedor", proveedor_id.lower())
+            self._get_cache.pop(cache_key, None)
+            if self.redis_cache is not None:
+                await self.redis_cache.delete(self._redis_key(cache_key))
+        for key in [key for key in self._get_cache if key[0] == "listar"]:
+            self._get_cache.pop(key, None)
+        if self.redis_cache is not None:
+            await self.redis_cache.invalidate_tag("listar")
+
+    @staticmethod
+    def _listar_params(
+        pais: Optional[str],
+        tipo_proveedor: Optional[str],
+        page: int,
+        page_size: int
+    ) -> Dict[str, Any]:
+        # page y page_size llegan validados (>= 1), solo se omiten los filtros vacíos
+        return {
+            key: value
+            for key, value in (
+                ("page", page),
+                ("page_size", page_size),
+                ("pais", pais),
+                ("tipo_proveedor", tipo_proveedor),
+            )
+            if value
+        }
+
+    async def _prefetch_listado(
+        self,
+        content: bytes,
+        pais: Optional[str],
+        tipo_proveedor: Optional[str],
+        page: int,
+        page_size: int
+    ) -> None:
+        """Carga en el cache la página siguiente a `content` sin propagar errores"""
+        if page >= orjson.loads(content).get("total_pages", 0):
+            return
+        page += 1
+        cache_key = ("listar", pais, tipo_proveedor, page, page_size)
+        if await self._cached(cache_key) is not None:
+            return
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/proveedores/",
-                    json=proveedor_data
-                )
-                
-                if response.status_code == 201:
-                    return response.json()
-                elif response.status_code == 409:
-                    raise HTTPException(status_code=409, detail=response.json())
-                elif response.status_code == 422:
-                    raise HTTPException(status_code=422, detail=response.json())
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from proveedores service: {response.text}"
-                    )
-        except httpx.RequestError as e:
-            logger.error(f"Error connecting to proveedores service: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail="Proveedores service is not available"
+            response = await self._send(
+                with_params(_LISTAR_REQUEST, self._listar_params(pais, tipo_proveedor, page, page_size)),
+                budget=HTTP_TIMEOUTS["listar_proveedores"]
             )
+            if response.status_code == 200:
+                await self._store({cache_key: response.content})
+        except httpx.RequestError as e:
+            logger.debug("Prefetch of proveedores page %s failed: %s", page, e)
+
+    async def health_check(self) -> Tuple[bool, Any]:
+        """Check the health of the Proveedores microservice"""
+        return await self.upstream.health(timeout=HTTP_TIMEOUTS["health_check"])
+
+    @_upstream_call
+    async def crear_proveedor(self, proveedor_data: Dict[str, Any]) -> bytes:
+        """Create a new proveedor via the proveedores service, returning the raw JSON body"""
+        response = await self._request(
+            "POST",
+            _LIST_PATH,
+            content=orjson.dumps(proveedor_data),
+            headers=JSON_HEADERS,
+            budget=HTTP_TIMEOUTS["crear_proveedor"]
+        )
+
+        content = _CREAR_STATUS(response)
+        await self._invalidate()
+        return content
     
+    @_upstream_call
     async def listar_proveedores(
         self,
         pais: Optional[str] = None,
         tipo_proveedor: Optional[str] = None,
         page: int = 1,
         page_size: int = 20
-    ) -> Dict[str, Any]:
-        """List proveedores with optional filters"""
-        try:
-            params = {
-                "page": page,
-                "page_size": page_size
-            }
-            if pais:
-                params["pais"] = pais
-            if tipo_proveedor:
-                params["tipo_proveedor"] = tipo_proveedor
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/proveedores/",
-                    params=params
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from proveedores service: {response.text}"
-                    )
-        except httpx.RequestError as e:
-            logger.error(f"Error connecting to proveedores service: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail="Proveedores service is not available"
-            )
+    ) -> bytes:
+        """List proveedores with optional filters, returning the raw JSON body"""
+        cache_key = ("listar", pais, tipo_proveedor, page, page_size)
+        return await request_scoped(cache_key, self._listar_proveedores, cache_key, pais, tipo_proveedor, page, page_size)
+
+    async def _listar_proveedores(
+        self,
+        cache_key: Tuple,
+        pais: Optional[str],
+        tipo_proveedor: Optional[str],
+        page: int,
+        page_size: int
+    ) -> bytes:
+        cached = await self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._send(
+            with_params(_LISTAR_REQUEST, self._listar_params(pais, tipo_proveedor, page, page_size)),
+            budget=HTTP_TIMEOUTS["listar_proveedores"]
+        )
+
+        content = _LISTAR_STATUS(response)
+        await self._store({cache_key: content})
+        # Precarga la siguiente página mientras el cliente procesa la actual
+        run_in_background(self._prefetch_listado(content, pais, tipo_proveedor, page, page_size))
+        return content
     
+    @_upstream_call
     async def obtener_proveedor(self, proveedor_id: str) -> Dict[str, Any]:
         """Get a specific proveedor by ID"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/proveedores/{proveedor_id}"
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    raise HTTPException(status_code=404, detail="Proveedor no encontrado")
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from proveedores service: {response.text}"
-                    )
-        except httpx.RequestError as e:
-            logger.error(f"Error connecting to proveedores service: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail="Proveedores service is not available"
-            )
+        proveedor_id = proveedor_id.lower()
+        return await request_scoped(("proveedor", proveedor_id), self._obtener_proveedor, proveedor_id)
+
+    async def _obtener_proveedor(self, proveedor_id: str) -> Dict[str, Any]:
+        cached = await self._cached(("proveedor", proveedor_id))
+        if cached is not None:
+            return cached
+
+        data = await self._batcher.load(proveedor_id)
+        if data is None:
+            raise HTTPException(status_code=404, detail="Proveedor no encontrado")
+        # Mismo cuerpo que GET /proveedores/{id} del microservicio: {"data": {...}}
+        return {"data": data}
+
+    async def _fetch_proveedores(self, proveedor_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        response = await self._send(
+            with_params(_LISTAR_REQUEST, {"ids": ",".join(proveedor_ids)}),
+            budget=HTTP_TIMEOUTS["obtener_proveedor"]
+        )
+
+        proveedores = {
+            proveedor["id"].lower(): proveedor
+            for proveedor in orjson.loads(_LISTAR_STATUS(response))["data"]
+        }
+        await self._store({("proveedor", proveedor_id): {"data": data} for proveedor_id, data in proveedores.items()})
+        return proveedores
     
+    @_upstream_call
     async def actualizar_proveedor(
         self,
         proveedor_id: str,
         proveedor_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Update an existing proveedor"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.put(
-                    f"{self.base_url}/proveedores/{proveedor_id}",
-                    json=proveedor_data
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    raise HTTPException(status_code=404, detail="Proveedor no encontrado")
-                elif response.status_code == 409:
-                    raise HTTPException(status_code=409, detail=response.json())
-                elif response.status_code == 422:
-                    raise HTTPException(status_code=422, detail=response.json())
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from proveedores service: {response.text}"
-                    )
-        except httpx.RequestError as e:
-            logger.error(f"Error connecting to proveedores service: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail="Proveedores service is not available"
-            )
+    ) -> bytes:
+        """Update an existing proveedor, returning the raw JSON body"""
+        response = await self._request(
+            "PUT",
+            f"/proveedores/{proveedor_id}",
+            content=orjson.dumps(proveedor_data),
+            headers=JSON_HEADERS,
+            budget=HTTP_TIMEOUTS["actualizar_proveedor"]
+        )
+
+        content = _ACTUALIZAR_STATUS(response)
+        await self._invalidate(proveedor_id)
+        return content
     
-    async def eliminar_proveedor(self, proveedor_id: str) -> Dict[str, Any]:
-        """Delete a proveedor"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.delete(
-                    f"{self.base_url}/proveedores/{proveedor_id}"
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    raise HTTPException(status_code=404, detail="Proveedor no encontrado")
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from proveedores service: {response.text}"
-                    )
-        except httpx.RequestError as e:
-            logger.error(f"Error connecting to proveedores service: {str(e)}")
-            raise HTTPException(
-                status_code=503,
-                detail="Proveedores service is not available"
-            )
+    @_upstream_call
+    async def eliminar_proveedor(self, proveedor_id: str) -> bytes:
+        """Delete a proveedor, returning the raw JSON body"""
+        response = await self._request(
+            "DELETE",
+            f"/proveedores/{proveedor_id}",
+            budget=HTTP_TIMEOUTS["eliminar_proveedor"]
+        )
+
+        content = _ELIMINAR_STATUS(response)
+        await self._invalidate(proveedor_id)
+        return content
 
 
+@lru_cache
 def get_proveedores_service() -> ProveedoresService:
     """Dependency function to get proveedores service instance"""
     return ProveedoresService()
@@ -0,0 +1,89 @@
+import logging
+from functools import lru_cache
+from typing import Dict, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from .settings import SETTINGS
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache:
+    """
+    Cache de respuestas compartido entre réplicas del BFF
+
+    Las llaves se guardan con el prefijo del servicio y un TTL corto. Las
+    llaves asociadas a un tag se registran en un set para poder invalidarlas
+    juntas. Cualquier falla de Redis se registra y se trata como un miss.
+    """
+
+    def __init__(self, client: redis.Redis, prefix: str, ttl: int = 60):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.client.get(self._key(key))
+        except RedisError as e:
+            logger.warning("Redis get failed for %s: %s", key, e)
+            return None
+
+    async def set_many(self, items: Dict[str, bytes], tag: Optional[str] = None) -> None:
+        if not items:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self._key(key), value, ex=self.ttl)
+                if tag is not None:
+                    pipe.sadd(self._tag_key(tag), *(self._key(key) for key in items))
+                    pipe.expire(self._tag_key(tag), self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Redis set failed for %s: %s", list(items), e)
+
+    async def set(self, key: str, value: bytes, tag: Optional[str] = None) -> None:
+        await self.set_many({key: value}, tag=tag)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self._key(key))
+        except RedisError as e:
+            logger.warning("Redis delete failed for %s: %s", key, e)
+
+    async def invalidate_tag(self, tag: str) -> None:
+        try:
+            tag_key = self._tag_key(tag)
+            keys = await self.client.smembers(tag_key)
+            await self.client.delete(tag_key, *keys)
+        except RedisError as e:
+            logger.warning("Redis invalidation failed for tag %s: %s", tag, e)
+
+
+@lru_cache
+def get_redis_client() -> redis.Redis:
+    """Cliente Redis asíncrono compartido por el proceso (conecta de forma perezosa)"""
+    return redis.Redis(
+        host=SETTINGS.redis_host,
+        port=SETTINGS.redis_port,
+        db=SETTINGS.redis_db,
+        password=SETTINGS.redis_password,
+        socket_connect_timeout=1,
+        socket_timeout=1,
+        health_check_interval=30,
+    )
+
+
+async def close_client() -> None:
+    """Cierra el pool de conexiones a Redis si llegó a crearse"""
+    if get_redis_client.cache_info().currsize:
+        await get_redis_client().aclose()
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ServiceSettings(BaseSettings):
+    """
+    Configuración del BFF: URLs de los microservicios consumidos y cache en Redis
+
+    Se leen del entorno una sola vez al importar el módulo (por ejemplo
+    PRODUCTOS_SERVICE_URL) y no cambian durante la vida del proceso.
+    """
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    auditoria_service_url: str = "http://auditoria-service:3000"
+    autenticacion_service_url: str = "http://autenticacion-service:3000"
+    clientes_service_url: str = "http://clientes-service:3000"
+    inventario_service_url: str = "http://inventario-service:3000"
+    logistica_service_url: str = "http://logistica-service:3000"
+    ordenes_commands_service_url: str = "http://order-command-api:3000"
+    ordenes_queries_service_url: str = "http://order-query-api:3000"
+    productos_service_url: str = "http://productos-service:3000"
+    proveedores_service_url: str = "http://proveedores-service:3000"
+    reportes_service_url: str = "http://reportes-service:3000"
+    ventas_service_url: str = "http://ventas-service:3000"
+
+    redis_host: str = "redis"
+    redis_port: int = 6379
+    redis_db: int = 0
+    redis_password: Optional[str] = None
+    enable_proveedores_cache: bool = False
+
+
+SETTINGS = ServiceSettings()
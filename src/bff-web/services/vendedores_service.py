@@ -1,59 +1,77 @@
 import httpx
-import os
-from typing import Optional, Dict, Any
+import orjson
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 import logging
+from functools import lru_cache
+from .http_client import (
+    JSON_HEADERS,
+    UpstreamClient,
+    raise_detail,
+    raise_with_body,
+    raw_body,
+    request_with_retries,
+    send_with_retries,
+    status_dispatcher,
+    with_params,
+)
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+VENTAS_SERVICE_URL = SETTINGS.ventas_service_url
+_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=1.0)
+
+_UPSTREAM = UpstreamClient("Ventas", VENTAS_SERVICE_URL, timeout=_TIMEOUT)
+_ASYNC_CLIENT = _UPSTREAM.client
+
+_LIST_PATH = "/vendedores/"
+
+# Plantilla pre-construida del listado, solo cambian los query params en cada llamada
+_LISTAR_REQUEST = _ASYNC_CLIENT.build_request("GET", _LIST_PATH)
+
+# Tablas status -> handler de cada operación
+_NOT_FOUND = raise_detail(404, "Vendedor no encontrado")
+_CREAR_STATUS = status_dispatcher("ventas", {201: raw_body, 409: raise_with_body, 422: raise_with_body})
+_LISTAR_STATUS = status_dispatcher("ventas", {200: raw_body})
+_OBTENER_STATUS = status_dispatcher("ventas", {200: raw_body, 404: _NOT_FOUND})
+_ACTUALIZAR_STATUS = status_dispatcher(
+    "ventas", {200: raw_body, 404: _NOT_FOUND, 409: raise_with_body, 422: raise_with_body}
+)
+
 
 class VendedoresService:
     """Service for communicating with the Ventas microservice (Vendedores endpoints)"""
 
     def __init__(self):
-        self.base_url = os.getenv("VENTAS_SERVICE_URL", "http://ventas-service:3000")
-        self.timeout = 30.0
+        self.base_url = VENTAS_SERVICE_URL
+        self.upstream = _UPSTREAM
+        self.async_client = _ASYNC_CLIENT
 
-    def health_check(self) -> Dict[str, Any]:
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.upstream.breaker.call(request_with_retries, self.upstream.client, method, url, **kwargs)
+
+    async def _send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self.upstream.breaker.call(send_with_retries, self.upstream.client, request, **kwargs)
+
+    async def health_check(self) -> Tuple[bool, Any]:
         """Check the health of the Ventas microservice"""
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Ventas microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Ventas service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Ventas microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Ventas service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Ventas health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
-
-    async def crear_vendedor(self, vendedor_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new vendedor via the ventas service"""
+        return await self.upstream.health()
+
+    async def crear_vendedor(self, vendedor_data: Dict[str, Any]) -> bytes:
+        """Create a new vendedor via the ventas service, returning the raw JSON body"""
         try:
             # Convert Decimal to float for JSON serialization
             if 'meta_venta' in vendedor_data and vendedor_data['meta_venta'] is not None:
                 vendedor_data['meta_venta'] = float(vendedor_data['meta_venta'])
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/vendedores/",
-                    json=vendedor_data
-                )
-
-                if response.status_code == 201:
-                    return response.json()
-                elif response.status_code == 409:
-                    raise HTTPException(status_code=409, detail=response.json())
-                elif response.status_code == 422:
-                    raise HTTPException(status_code=422, detail=response.json())
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from ventas service: {response.text}"
-                    )
+            response = await self.upstream.post(
+                _LIST_PATH,
+                content=orjson.dumps(vendedor_data),
+                headers=JSON_HEADERS
+            )
+
+            return _CREAR_STATUS(response)
         except httpx.RequestError as e:
             logger.error(f"Error connecting to ventas service: {str(e)}")
             raise HTTPException(
@@ -65,27 +83,14 @@ class VendedoresService:
         self,
         page: int = 1,
         page_size: int = 20
-    ) -> Dict[str, Any]:
-        """List vendedores with pagination"""
+    ) -> bytes:
+        """List vendedores with pagination, returning the raw JSON body"""
         try:
-            params = {
-                "page": page,
-                "page_size": page_size
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/vendedores/",
-                    params=params
-                )
-
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from ventas service: {response.text}"
-                    )
+            response = await self._send(
+                with_params(_LISTAR_REQUEST, {"page": page, "page_size": page_size})
+            )
+
+            return _LISTAR_STATUS(response)
         except httpx.RequestError as e:
             logger.error(f"Error connecting to ventas service: {str(e)}")
             raise HTTPException(
@@ -93,23 +98,15 @@ class VendedoresService:
                 detail="Ventas service is not available"
             )
 
-    async def obtener_vendedor(self, vendedor_id: str) -> Dict[str, Any]:
-        """Get a specific vendedor by ID"""
+    async def obtener_vendedor(self, vendedor_id: str) -> bytes:
+        """Get a specific vendedor by ID, returning the raw JSON body"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/vendedores/{vendedor_id}"
-                )
-
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    raise HTTPException(status_code=404, detail="Vendedor no encontrado")
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from ventas service: {response.text}"
-                    )
+            response = await self._request(
+                "GET",
+                f"/vendedores/{vendedor_id}"
+            )
+
+            return _OBTENER_STATUS(response)
         except httpx.RequestError as e:
             logger.error(f"Error connecting to ventas service: {str(e)}")
             raise HTTPException(
@@ -121,32 +118,21 @@ class VendedoresService:
         self,
         vendedor_id: str,
         vendedor_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Update an existing vendedor"""
+    ) -> bytes:
+        """Update an existing vendedor, returning the raw JSON body"""
         try:
             # Convert Decimal to float for JSON serialization
             if 'meta_venta' in vendedor_data and vendedor_data['meta_venta'] is not None:
                 vendedor_data['meta_venta'] = float(vendedor_data['meta_venta'])
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.put(
-                    f"{self.base_url}/vendedores/{vendedor_id}",
-                    json=vendedor_data
-                )
-
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    raise HTTPException(status_code=404, detail="Vendedor no encontrado")
-                elif response.status_code == 409:
-                    raise HTTPException(status_code=409, detail=response.json())
-                elif response.status_code == 422:
-                    raise HTTPException(status_code=422, detail=response.json())
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from ventas service: {response.text}"
-                    )
+            response = await self._request(
+                "PUT",
+                f"/vendedores/{vendedor_id}",
+                content=orjson.dumps(vendedor_data),
+                headers=JSON_HEADERS
+            )
+
+            return _ACTUALIZAR_STATUS(response)
         except httpx.RequestError as e:
             logger.error(f"Error connecting to ventas service: {str(e)}")
             raise HTTPException(
@@ -155,6 +141,7 @@ class VendedoresService:
             )
 
 
+@lru_cache
 def get_vendedores_service() -> VendedoresService:
     """Dependency function to get vendedores service instance"""
     return VendedoresService()
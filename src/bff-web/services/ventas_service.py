@@ -1,33 +1,28 @@
-import httpx
-import os
-from typing import Dict, Any
-from fastapi import HTTPException
+from typing import Dict, Any, Tuple
 import logging
+from functools import lru_cache
+from .http_client import DEFAULT_TIMEOUT, UpstreamClient
+from .settings import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+VENTAS_SERVICE_URL = SETTINGS.ventas_service_url
+_TIMEOUT = DEFAULT_TIMEOUT
+
+_UPSTREAM = UpstreamClient("Ventas", VENTAS_SERVICE_URL, timeout=_TIMEOUT)
+
 
 class VentasService:
     
     def __init__(self):
-        self.base_url = os.getenv("VENTAS_SERVICE_URL", "http://ventas-service:3000")
-        self.timeout = 30.0
+        self.base_url = VENTAS_SERVICE_URL
+        self.timeout = _TIMEOUT
+        self.upstream = _UPSTREAM
     
-    def health_check(self) -> Dict[str, Any]:
-        try:
-            response = httpx.get(f"{self.base_url}/health", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Health check failed for Ventas microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Ventas service returned error: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to connect to Ventas microservice: {e}")
-            raise HTTPException(status_code=503, detail=f"Cannot reach Ventas service: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error checking Ventas health: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+    async def health_check(self) -> Tuple[bool, Any]:
+        return await self.upstream.health(timeout=self.timeout)
 
+@lru_cache
 def get_ventas_service() -> VentasService:
     return VentasService()
 
@@ -1,6 +1,7 @@
 import os
 import sys
 from pathlib import Path
+import httpx
 import pytest
 from types import SimpleNamespace
 
@@ -25,24 +26,25 @@ class FakeDB:
         return SimpleNamespace()
 
 
+class _FakeRedisConnection:
+    def __init__(self, connected: bool):
+        self._connected = connected
+
+    def ping(self):
+        return self._connected
+
+
 class FakeRedisClient:
     def __init__(self, should_fail: bool = False, connected: bool = True):
         self.should_fail = should_fail
         self.connected = connected
+        self._inner = _FakeRedisConnection(connected)
 
     @property
     def client(self):
         if self.should_fail:
             raise RuntimeError("Redis error")
-
-        class _Client:
-            def __init__(self, connected: bool):
-                self._connected = connected
-
-            def ping(self):
-                return self._connected
-
-        return _Client(self.connected)
+        return self._inner
 
 
 @pytest.fixture
@@ -68,3 +70,26 @@ def failing_cache_deps():
         "redis_client": FakeRedisClient(should_fail=False, connected=False),
     }
 
+
+@pytest.fixture
+def upstream_responses():
+    """Respuestas del microservicio simulado por ruta: un httpx.Response o la excepción a lanzar"""
+    return {}
+
+
+@pytest.fixture
+def upstream_requests():
+    """Peticiones que recibió el microservicio simulado"""
+    return []
+
+
+@pytest.fixture
+def mock_transport(upstream_responses, upstream_requests):
+    def handler(request):
+        upstream_requests.append(request)
+        response = upstream_responses[request.url.path]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return httpx.MockTransport(handler)
@@ -1,18 +1,30 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
 import pytest
-from unittest.mock import Mock, patch
 import httpx
 from fastapi import HTTPException
 
 from services.clientes_service import ClientesService
+from services.http_client import UpstreamClient
+
+BASE_URL = "http://test-service:3000"
 
 
 class TestClientesService:
-    
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self):
+        with patch("services.http_client.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            yield mock_sleep
+
     @pytest.fixture
-    def clientes_service(self):
-        with patch.dict('os.environ', {'CLIENTES_SERVICE_URL': 'http://test-service:3000'}):
-            return ClientesService()
-    
+    def clientes_service(self, mock_transport):
+        service = ClientesService()
+        service.upstream = UpstreamClient(
+            "Clientes", BASE_URL, timeout=service.timeout, transport=mock_transport
+        )
+        return service
+
     @pytest.fixture
     def sample_response(self):
         return {
@@ -27,99 +39,62 @@ class TestClientesService:
             "total": 1
         }
 
-    def test_health_check_success(self, clientes_service):
+    def test_health_check_success(self, clientes_service, upstream_responses, upstream_requests):
         """Test exitoso para health check"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"status": "healthy"}
-        mock_response.raise_for_status.return_value = None
-        
-        with patch('httpx.get', return_value=mock_response) as mock_get:
-            result = clientes_service.health_check()
-            
-            assert result == {"status": "healthy"}
-            mock_get.assert_called_once_with("http://test-service:3000/health", timeout=30.0)
-
-    def test_health_check_service_error(self, clientes_service):
-        """Test para error del servicio"""
-        with patch('httpx.get') as mock_get:
-            mock_get.side_effect = httpx.HTTPStatusError("Service error", request=Mock(), response=Mock())
-            
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.health_check()
-            
-            assert exc_info.value.status_code == 503
-
-    def test_health_check_connection_error(self, clientes_service):
-        """Test para error de conexión"""
-        with patch('httpx.get') as mock_get:
-            mock_get.side_effect = httpx.RequestError("Connection error")
-            
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.health_check()
-            
-            assert exc_info.value.status_code == 503
-
-    def test_get_clientes_asignados_success(self, clientes_service, sample_response):
+        upstream_responses["/health"] = httpx.Response(200, json={"status": "healthy"})
+
+        ok, result = asyncio.run(clientes_service.health_check())
+
+        assert ok is True
+        assert result == {"status": "healthy"}
+        assert upstream_requests[0].url == f"{BASE_URL}/health"
+        assert upstream_requests[0].extensions["timeout"] == clientes_service.timeout.as_dict()
+
+    @pytest.mark.parametrize("upstream", [
+        httpx.Response(503),
+        httpx.ConnectError("Connection error"),
+    ], ids=["service_error", "connection_error"])
+    def test_health_check_failure(self, clientes_service, upstream_responses, upstream):
+        """Test para health check con el servicio caído o respondiendo con error"""
+        upstream_responses["/health"] = upstream
+
+        ok, detail = asyncio.run(clientes_service.health_check())
+
+        assert ok is False
+        assert "Clientes service" in detail
+
+    def test_get_clientes_asignados_success(
+        self, clientes_service, sample_response, upstream_responses, upstream_requests
+    ):
         """Test exitoso para obtener clientes asignados"""
-        mock_response = Mock()
-        mock_response.json.return_value = sample_response
-        mock_response.raise_for_status.return_value = None
-        
-        with patch('httpx.get', return_value=mock_response) as mock_get:
-            result = clientes_service.get_clientes_asignados("Bearer test-token")
-            
-            assert result == sample_response
-            mock_get.assert_called_once_with(
-                "http://test-service:3000/api/clientes/asignados",
-                headers={
-                    "Authorization": "Bearer test-token",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
-
-    def test_get_clientes_asignados_unauthorized(self, clientes_service):
-        """Test para token no autorizado"""
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Unauthorized", request=Mock(), response=mock_response
-        )
-        
-        with patch('httpx.get', return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.get_clientes_asignados("Bearer invalid-token")
-            
-            assert exc_info.value.status_code == 401
-            assert "Token de autorización inválido" in str(exc_info.value.detail)
-
-    def test_get_clientes_asignados_not_found(self, clientes_service):
-        """Test para no encontrado"""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Not Found", request=Mock(), response=mock_response
-        )
-        
-        with patch('httpx.get', return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.get_clientes_asignados("Bearer test-token")
-            
-            assert exc_info.value.status_code == 404
-            assert "No se encontraron clientes asignados" in str(exc_info.value.detail)
-
-    def test_get_clientes_asignados_service_unavailable(self, clientes_service):
-        """Test para servicio no disponible"""
-        with patch('httpx.get') as mock_get:
-            mock_get.side_effect = httpx.RequestError("Service unavailable")
-            
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.get_clientes_asignados("Bearer test-token")
-            
-            assert exc_info.value.status_code == 503
-            assert "No se puede conectar" in str(exc_info.value.detail)
-
-    def test_get_cliente_asignado_success(self, clientes_service):
+        upstream_responses["/api/clientes/asignados"] = httpx.Response(200, json=sample_response)
+
+        result = asyncio.run(clientes_service.get_clientes_asignados("Bearer test-token"))
+
+        assert result == sample_response
+        assert upstream_requests[0].url == f"{BASE_URL}/api/clientes/asignados"
+        assert upstream_requests[0].headers["Authorization"] == "Bearer test-token"
+        assert upstream_requests[0].headers["Content-Type"] == "application/json"
+
+    @pytest.mark.parametrize("upstream, status_code, detail", [
+        (httpx.Response(401), 401, "Token de autorización inválido"),
+        (httpx.Response(404), 404, "No se encontraron clientes asignados"),
+        (httpx.ConnectError("Service unavailable"), 503, "No se puede conectar"),
+        (RuntimeError("Unexpected error"), 500, "Error interno del servidor"),
+    ], ids=["unauthorized", "not_found", "service_unavailable", "unexpected_error"])
+    def test_get_clientes_asignados_errors(
+        self, clientes_service, upstream_responses, upstream, status_code, detail
+    ):
+        """Test para traducir los errores del servicio de clientes"""
+        upstream_responses["/api/clientes/asignados"] = upstream
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(clientes_service.get_clientes_asignados("Bearer test-token"))
+
+        assert exc_info.value.status_code == status_code
+        assert detail in str(exc_info.value.detail)
+
+    def test_get_cliente_asignado_success(self, clientes_service, upstream_responses, upstream_requests):
         """Test exitoso para obtener cliente específico"""
         cliente_data = {
             "id": "C001",
@@ -127,61 +102,34 @@ class TestClientesService:
             "nit": "901234567-8",
             "logoUrl": "https://storage.googleapis.com/logos/hospital-general.png"
         }
-        
-        mock_response = Mock()
-        mock_response.json.return_value = cliente_data
-        mock_response.raise_for_status.return_value = None
-        
-        with patch('httpx.get', return_value=mock_response) as mock_get:
-            result = clientes_service.get_cliente_asignado("C001", "Bearer test-token")
-            
-            assert result == cliente_data
-            mock_get.assert_called_once_with(
-                "http://test-service:3000/api/clientes/asignados/C001",
-                headers={
-                    "Authorization": "Bearer test-token",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
-
-    def test_get_cliente_asignado_not_found(self, clientes_service):
-        """Test para cliente no encontrado"""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Not Found", request=Mock(), response=mock_response
-        )
-        
-        with patch('httpx.get', return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.get_cliente_asignado("C999", "Bearer test-token")
-            
-            assert exc_info.value.status_code == 404
-            assert "Cliente C999 no encontrado" in str(exc_info.value.detail)
-
-    def test_get_cliente_asignado_unauthorized(self, clientes_service):
-        """Test para cliente no autorizado"""
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Unauthorized", request=Mock(), response=mock_response
-        )
-        
-        with patch('httpx.get', return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.get_cliente_asignado("C001", "Bearer invalid-token")
-            
-            assert exc_info.value.status_code == 401
-            assert "Token de autorización inválido" in str(exc_info.value.detail)
-
-    def test_unexpected_error(self, clientes_service):
-        """Test para error inesperado"""
-        with patch('httpx.get') as mock_get:
-            mock_get.side_effect = Exception("Unexpected error")
-            
-            with pytest.raises(HTTPException) as exc_info:
-                clientes_service.get_clientes_asignados("Bearer test-token")
-            
-            assert exc_info.value.status_code == 500
-            assert "Error interno del servidor" in str(exc_info.value.detail)
+        upstream_responses["/api/clientes/asignados/C001"] = httpx.Response(200, json=cliente_data)
+
+        result = asyncio.run(clientes_service.get_cliente_asignado("C001", "Bearer test-token"))
+
+        assert result == cliente_data
+        assert upstream_requests[0].url == f"{BASE_URL}/api/clientes/asignados/C001"
+        assert upstream_requests[0].headers["Authorization"] == "Bearer test-token"
+
+    @pytest.mark.parametrize("cliente_id, status_code, detail", [
+        ("C999", 404, "Cliente C999 no encontrado"),
+        ("C001", 401, "Token de autorización inválido"),
+    ], ids=["not_found", "unauthorized"])
+    def test_get_cliente_asignado_errors(self, clientes_service, upstream_responses, cliente_id, status_code, detail):
+        """Test para traducir los errores al obtener un cliente específico"""
+        upstream_responses[f"/api/clientes/asignados/{cliente_id}"] = httpx.Response(status_code)
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(clientes_service.get_cliente_asignado(cliente_id, "Bearer test-token"))
+
+        assert exc_info.value.status_code == status_code
+        assert detail in str(exc_info.value.detail)
+
+    def test_get_clientes_asignados_retries_connection_errors(self, clientes_service, upstream_responses, upstream_requests):
+        """Test para reintentar el GET de clientes asignados ante errores de conexión"""
+        upstream_responses["/api/clientes/asignados"] = httpx.ConnectError("Connection error")
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(clientes_service.get_clientes_asignados("Bearer test-token"))
+
+        assert exc_info.value.status_code == 503
+        assert len(upstream_requests) == 4
@@ -0,0 +1,320 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from services.http_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RequestCacheMiddleware,
+    SingleFlight,
+    UpstreamClient,
+    async_transport,
+    json_body,
+    raise_with_body,
+    request_scoped,
+    request_with_retries,
+    send_with_retries,
+    status_dispatcher,
+    sync_transport,
+    upstream_call,
+    with_params,
+)
+
+
+def _client(handler):
+    return httpx.AsyncClient(base_url="http://test-service:3000", transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("services.http_client.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        yield mock_sleep
+
+
+def test_get_retries_transient_status_until_success():
+    """Test para reintentar un GET ante un 503 transitorio"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    response = asyncio.run(request_with_retries(_client(handler), "GET", "/proveedores/"))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_get_returns_last_response_when_retries_exhausted():
+    """Test para retornar la última respuesta al agotar los reintentos"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    response = asyncio.run(request_with_retries(_client(handler), "GET", "/proveedores/", max_retries=2))
+
+    assert response.status_code == 502
+    assert len(calls) == 3
+
+
+def test_connection_error_is_raised_after_retries():
+    """Test para propagar el error de conexión al agotar los reintentos"""
+    def handler(request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    with pytest.raises(httpx.RequestError):
+        asyncio.run(request_with_retries(_client(handler), "GET", "/proveedores/", max_retries=1))
+
+
+def test_post_without_idempotency_key_is_not_retried():
+    """Test para no reintentar un POST sin llave de idempotencia"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    response = asyncio.run(request_with_retries(_client(handler), "POST", "/proveedores/", json={}))
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+def test_post_with_idempotency_key_is_retried():
+    """Test para reintentar un POST que envía llave de idempotencia"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(201, json={"id": "1"})
+
+    response = asyncio.run(request_with_retries(
+        _client(handler), "POST", "/proveedores/", json={}, headers={"Idempotency-Key": "abc"}
+    ))
+
+    assert response.status_code == 201
+    assert len(calls) == 2
+
+
+def test_retries_stop_when_budget_is_exhausted():
+    """Test para no reintentar cuando el budget de latencia se agotó"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    response = asyncio.run(request_with_retries(_client(handler), "GET", "/proveedores/", budget=0.0))
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    """Test para abrir el circuito y fallar rápido sin contactar al upstream"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = _client(handler)
+    breaker = CircuitBreaker("proveedores", fail_max=2, reset_timeout=30.0)
+
+    async def run():
+        for _ in range(2):
+            await breaker.call(request_with_retries, client, "GET", "/proveedores/", max_retries=0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(request_with_retries, client, "GET", "/proveedores/", max_retries=0)
+
+    asyncio.run(run())
+
+    assert breaker.is_open
+    assert len(calls) == 2
+
+
+def test_circuit_breaker_closes_after_successful_trial():
+    """Test para cerrar el circuito cuando la petición de prueba responde bien"""
+    def handler(request):
+        return httpx.Response(200, json={"ok": True})
+
+    breaker = CircuitBreaker("proveedores", fail_max=1, reset_timeout=0.0)
+    breaker.record_failure()
+
+    response = asyncio.run(breaker.call(request_with_retries, _client(handler), "GET", "/proveedores/"))
+
+    assert response.status_code == 200
+    assert not breaker.is_open
+
+
+def test_circuit_breaker_half_open_lets_a_single_trial_through():
+    """Test para dejar pasar una sola petición de prueba tras el cool-off y reabrir si falla"""
+    calls = []
+    breaker = CircuitBreaker("proveedores", fail_max=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        gate = loop.create_future()
+
+        async def fetch():
+            calls.append(1)
+            await gate
+            return httpx.Response(503)
+
+        tasks = [asyncio.create_task(breaker.call(fetch)) for _ in range(20)]
+        loop.call_soon(gate.set_result, None)
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert sum(isinstance(result, CircuitOpenError) for result in results) == 19
+    assert breaker.is_open
+
+
+def test_upstream_client_fails_fast_while_circuit_is_open():
+    """Test para fallar sin contactar al microservicio mientras su circuito está abierto"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    upstream = UpstreamClient("Ventas", "http://test-service:3000", timeout=1.0, fail_max=1)
+    upstream.client = _client(handler)
+
+    async def run():
+        with pytest.raises(httpx.ConnectError):
+            await upstream.get("/vendedores/")
+        with pytest.raises(CircuitOpenError):
+            await upstream.get("/vendedores/")
+
+    asyncio.run(run())
+
+    assert len(calls) == 1
+
+
+def test_send_prebuilt_request_with_params():
+    """Test para enviar una plantilla pre-construida cambiando solo los query params"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    client = _client(handler)
+    template = client.build_request("GET", "/proveedores/")
+
+    response = asyncio.run(send_with_retries(client, with_params(template, {"page": 2, "page_size": 20})))
+
+    assert response.status_code == 200
+    assert calls[0].url.path == "/proveedores/"
+    assert calls[0].url.params["page"] == "2"
+    assert "page" not in template.url.params
+
+
+def test_upstream_call_translates_not_found():
+    """Test para traducir un 404 del upstream con el detalle formateado"""
+    @upstream_call("productos", not_found_detail="Producto {producto_id} no encontrado")
+    async def get_producto(producto_id):
+        request = httpx.Request("GET", f"http://test-service:3000/api/productos/{producto_id}")
+        httpx.Response(404, request=request).raise_for_status()
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_producto("P001"))
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "Producto P001 no encontrado"
+
+
+def test_upstream_call_translates_connection_error():
+    """Test para traducir un error de conexión a 503"""
+    @upstream_call("productos")
+    async def get_productos():
+        raise httpx.ConnectError("Connection refused")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_productos())
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == "No se puede conectar con el servicio de productos"
+
+
+def test_status_dispatcher_resolves_responses_by_status():
+    """Test para resolver cada status con su handler y reportar los no listados"""
+    dispatch = status_dispatcher("ventas", {200: json_body, 409: raise_with_body})
+
+    assert dispatch(httpx.Response(200, json={"id": "V001"})) == {"id": "V001"}
+
+    with pytest.raises(HTTPException) as exc_info:
+        dispatch(httpx.Response(409, json={"detail": "Email duplicado"}))
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == {"detail": "Email duplicado"}
+
+    with pytest.raises(HTTPException) as exc_info:
+        dispatch(httpx.Response(500, text="boom"))
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Error from ventas service: boom"
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test para ejecutar una sola vez las llamadas concurrentes con la misma llave"""
+    calls = []
+    flight = SingleFlight()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        gate = loop.create_future()
+
+        async def fetch():
+            calls.append(1)
+            await gate
+            return {"id": "P001"}
+
+        tasks = [asyncio.create_task(flight.do(("producto", "P001"), fetch)) for _ in range(3)]
+        loop.call_soon(gate.set_result, None)
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+
+    assert results == [{"id": "P001"}] * 3
+    assert len(calls) == 1
+
+
+def test_request_scoped_dedupes_calls_within_one_request():
+    """Test para ejecutar una sola vez las llamadas repetidas dentro de una misma petición"""
+    calls = []
+    results = []
+
+    async def fetch(proveedor_id):
+        calls.append(proveedor_id)
+        return {"id": proveedor_id}
+
+    async def app(scope, receive, send):
+        for _ in range(2):
+            results.append(await request_scoped(("proveedor", "p1"), fetch, "p1"))
+
+    middleware = RequestCacheMiddleware(app)
+    asyncio.run(middleware({"type": "http"}, None, None))
+    asyncio.run(middleware({"type": "http"}, None, None))
+
+    assert results == [{"id": "p1"}] * 4
+    assert len(calls) == 2
+
+
+def test_shared_transports_negotiate_http2():
+    """Test para ofrecer HTTP/2 en los transportes compartidos con los upstreams"""
+    assert async_transport()._pool._http2 is True
+    assert sync_transport()._pool._http2 is True
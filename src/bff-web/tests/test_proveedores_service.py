@@ -0,0 +1,171 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from services import http_client
+from services.proveedores_service import ProveedoresService
+from services.redis_cache import RedisCache
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def smembers(self, key):
+        return self.store.get(key, set())
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.redis.store[key] = value
+
+    def sadd(self, key, *members):
+        self.redis.store.setdefault(key, set()).update(members)
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        return []
+
+
+class TestProveedoresServiceCache:
+
+    @pytest.fixture
+    def proveedores_service(self):
+        service = ProveedoresService()
+        service._get_cache.clear()
+        service._request = service._send = AsyncMock()
+        yield service
+        service._get_cache.clear()
+
+    def test_obtener_proveedor_uses_cache(self, proveedores_service):
+        """Test para servir desde cache una segunda lectura del mismo proveedor"""
+        proveedores_service._request.return_value = httpx.Response(200, json={"data": [{"id": "p001"}]})
+
+        first = asyncio.run(proveedores_service.obtener_proveedor("p001"))
+        second = asyncio.run(proveedores_service.obtener_proveedor("p001"))
+
+        assert first == second == {"data": {"id": "p001"}}
+        assert proveedores_service._request.await_count == 1
+
+    def test_actualizar_proveedor_invalidates_cache(self, proveedores_service):
+        """Test para invalidar el proveedor y los listados cacheados tras actualizar"""
+        proveedores_service._request.side_effect = [
+            httpx.Response(200, json={"data": [{"id": "p001"}]}),
+            httpx.Response(200, json={"data": [], "total": 0}),
+            httpx.Response(200, json={"id": "p001", "nombre": "Nuevo"}),
+            httpx.Response(200, json={"data": [{"id": "p001", "nombre": "Nuevo"}]}),
+        ]
+
+        asyncio.run(proveedores_service.obtener_proveedor("p001"))
+        asyncio.run(proveedores_service.listar_proveedores())
+        asyncio.run(proveedores_service.actualizar_proveedor("p001", {"nombre": "Nuevo"}))
+        result = asyncio.run(proveedores_service.obtener_proveedor("p001"))
+
+        assert result == {"data": {"id": "p001", "nombre": "Nuevo"}}
+        assert proveedores_service._get_cache.get(("listar", None, None, 1, 20)) is None
+        assert proveedores_service._request.await_count == 4
+
+    def test_listar_proveedores_prefetches_next_page(self, proveedores_service):
+        """Test para precargar en background la siguiente página del listado"""
+        pagina = {"data": [], "total": 40, "page": 1, "page_size": 20, "total_pages": 2}
+        proveedores_service._request.return_value = httpx.Response(200, json=pagina)
+
+        async def run():
+            content = await proveedores_service.listar_proveedores()
+            await asyncio.gather(*http_client._BACKGROUND_TASKS)
+            return content
+
+        content = asyncio.run(run())
+
+        assert orjson.loads(content) == pagina
+
+        assert ("listar", None, None, 2, 20) in proveedores_service._get_cache
+        assert proveedores_service._request.await_count == 2
+
+    def test_listar_proveedores_no_prefetch_on_last_page(self, proveedores_service):
+        """Test para no precargar cuando la página actual es la última"""
+        pagina = {"data": [], "total": 5, "page": 1, "page_size": 20, "total_pages": 1}
+        proveedores_service._request.return_value = httpx.Response(200, json=pagina)
+
+        async def run():
+            await proveedores_service.listar_proveedores()
+            await asyncio.gather(*http_client._BACKGROUND_TASKS)
+
+        asyncio.run(run())
+
+        assert ("listar", None, None, 2, 20) not in proveedores_service._get_cache
+        assert proveedores_service._request.await_count == 1
+
+    def test_obtener_proveedor_batches_concurrent_calls(self, proveedores_service):
+        """Test para agrupar obtener_proveedor concurrentes en una sola petición por IDs"""
+        proveedores_service._send.return_value = httpx.Response(
+            200, json={"data": [{"id": "p001"}, {"id": "p002"}]}
+        )
+
+        async def run():
+            return await asyncio.gather(
+                proveedores_service.obtener_proveedor("p001"),
+                proveedores_service.obtener_proveedor("P002"),
+                proveedores_service.obtener_proveedor("p003"),
+                return_exceptions=True
+            )
+
+        first, second, missing = asyncio.run(run())
+
+        assert first == {"data": {"id": "p001"}}
+        assert second == {"data": {"id": "p002"}}
+        assert isinstance(missing, HTTPException) and missing.status_code == 404
+        assert proveedores_service._send.await_count == 1
+        request = proveedores_service._send.await_args.args[0]
+        assert request.url.params["ids"] == "p001,p002,p003"
+
+    def test_listar_proveedores_uses_redis_between_replicas(self, proveedores_service):
+        """Test para servir el listado desde Redis cuando el cache local no lo tiene"""
+        proveedores_service.redis_cache = RedisCache(FakeAsyncRedis(), prefix="prov", ttl=60)
+        proveedores_service._request.return_value = httpx.Response(200, json={"data": [], "total": 0})
+
+        first = asyncio.run(proveedores_service.listar_proveedores())
+        proveedores_service._get_cache.clear()
+        second = asyncio.run(proveedores_service.listar_proveedores())
+
+        assert first == second
+        assert proveedores_service._request.await_count == 1
+
+    def test_crear_proveedor_invalidates_redis_listings(self, proveedores_service):
+        """Test para invalidar en Redis los listados cacheados tras crear un proveedor"""
+        redis = FakeAsyncRedis()
+        proveedores_service.redis_cache = RedisCache(redis, prefix="prov", ttl=60)
+        proveedores_service._request.side_effect = [
+            httpx.Response(200, json={"data": [], "total": 0}),
+            httpx.Response(201, json={"id": "p001"}),
+        ]
+
+        asyncio.run(proveedores_service.listar_proveedores())
+        asyncio.run(proveedores_service.crear_proveedor({"nombre": "Nuevo"}))
+
+        assert "prov:listar:None:None:1:20" not in redis.store
@@ -17,13 +17,22 @@ if os.getenv("TESTING"):
 else:
     SQLALCHEMY_DATABASE_URL = get_database_uri()
 
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 30
+
+# Los endpoints son síncronos y corren en el threadpool de AnyIO (40 hilos por defecto); se dimensiona
+# al pool de conexiones (pool_size + max_overflow) para que una llamada lenta a autenticación o a la
+# base de datos no deje peticiones en cola mientras aún hay conexiones libres. El pool de Redis
+# (db/redis_client.py) se dimensiona a partir de este valor
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=(
         {"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
     ),
-    pool_size=20,
-    max_overflow=30,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     pool_timeout=60,
     pool_recycle=1800
 )
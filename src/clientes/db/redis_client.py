@@ -1,10 +1,17 @@
+import atexit
 import os
 import redis
-from typing import Optional
+from typing import Dict, List, Optional, Union
 import logging
+from db.database import THREADPOOL_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Cada hilo del worker puede tener a la vez un comando en curso (PING + GET en asignados) y el
+# listener de invalidación retiene una conexión fija: con menos conexiones que hilos, los
+# sobrantes esperarían hasta `timeout` por Redis aunque haya conexiones libres a la base de datos
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", str(THREADPOOL_SIZE + 1)))
+
 class RedisClient:
     _instance: Optional['RedisClient'] = None
     _client: Optional[redis.Redis] = None
@@ -26,17 +33,25 @@ class RedisClient:
         redis_password = os.getenv("REDIS_PASSWORD", None)
         
         try:
-            self._client = redis.Redis(
+            # Pool acotado compartido por los hilos del worker: cada comando toma una conexión
+            # abierta y la devuelve; si están todas ocupadas espera hasta `timeout` en vez de abrir más
+            pool = redis.BlockingConnectionPool(
                 host=redis_host,
                 port=redis_port,
                 db=redis_db,
                 password=redis_password,
-                decode_responses=True,
+                max_connections=REDIS_POOL_SIZE,
+                timeout=5,
+                # Los valores cacheados son JSON que se devuelve o parsea tal cual: como bytes
+                # se evita decodificarlos a str para volver a codificarlos en la respuesta
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
                 health_check_interval=30
             )
+            self._client = redis.Redis(connection_pool=pool)
+            atexit.register(pool.disconnect)
             self._client.ping()
             logger.info(f"Successfully connected to Redis at {redis_host}:{redis_port}")
         except redis.ConnectionError as e:
@@ -66,6 +81,38 @@ class RedisClient:
             logger.error(f"Unexpected error checking Redis connection: {e}")
             return False
 
+    def mget_json(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Lee varias llaves en un solo round-trip (MGET); las llaves ausentes vienen como None"""
+        return self._client.mget(keys)
+
+    def mset_json(self, mapping: Dict[str, Union[str, bytes]], ttl: int) -> None:
+        """Guarda varias llaves con el mismo TTL en un solo round-trip"""
+        pipe = self._client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.setex(key, ttl, value)
+        pipe.execute()
+
+    def invalidate_namespace(self, prefix: str, batch_size: int = 500) -> int:
+        """
+        Borra todas las llaves que empiezan con `prefix`
+
+        Recorre el keyspace con SCAN (no bloquea Redis como KEYS) y borra por tandas con UNLINK,
+        que libera la memoria en segundo plano.
+
+        Returns:
+            Cantidad de llaves borradas
+        """
+        deleted = 0
+        batch = []
+        for key in self._client.scan_iter(match=f"{prefix}*", count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += self._client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self._client.unlink(*batch)
+        return deleted
+
 # Global Redis client instance
 redis_client = RedisClient()
 
@@ -1,20 +1,42 @@
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from services.health_service import HealthService, get_health_service
-from router.cliente_router import router as cliente_router
+from router.cliente_router import router as cliente_router, get_redis_client
+from services.cliente_service import close_client, start_cache_invalidation_listener
 from router.mock_router import router as mock_router
-from db.database import engine, Base
+from db.database import engine, Base, THREADPOOL_SIZE
+from contextlib import asynccontextmanager
+import anyio
 import logging 
+import os
 
-logging.basicConfig(level=logging.DEBUG, force=True)
+# Nivel configurable por entorno; en producción INFO evita formatear los mensajes de debug
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Crear las tablas al arrancar el servidor y no al importar el módulo; en testing se omite
+    invalidation_listener = None
+    if not os.getenv("TESTING"):
+        Base.metadata.create_all(bind=engine)
+        logger.info("Database tables created successfully")
+        invalidation_listener = start_cache_invalidation_listener(get_redis_client())
+    yield
+    if invalidation_listener is not None:
+        invalidation_listener.stop()
+    close_client()
+
+
 app = FastAPI(
     title="MediSupply Clientes Service",
     description="Servicio para gestión de clientes institucionales",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
-Base.metadata.create_all(bind=engine)
-logger.info("Database tables created successfully")
 
 # Incluir routers
 app.include_router(cliente_router)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import validates
 from datetime import datetime, timezone
 import uuid
 from db.database import Base
@@ -7,6 +8,15 @@ from db.database import Base
 
 class ClienteInstitucional(Base):
     __tablename__ = "clientes_institucionales"
+    __table_args__ = (
+        # Índice de cobertura para get_clientes_asignados: en PostgreSQL el filtro por vendedor
+        # se resuelve con un index-only scan, sin leer las filas de la tabla
+        Index(
+            "ix_ci_vendedor_cover",
+            "id_vendedor",
+            postgresql_include=["id", "nombre", "nit", "logo_url"],
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     fecha_creacion = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -17,27 +27,9 @@ class ClienteInstitucional(Base):
     logo_url = Column(String(500), nullable=True)
     address = Column(String(500), nullable=True)
     
-    id_vendedor = Column(UUID(as_uuid=True), nullable=True, index=True)
+    id_vendedor = Column(UUID(as_uuid=True), nullable=True)
 
-    def __init__(self, nombre: str, nit: str, id_vendedor: str, address:str, logo_url: str = None):
-        now = datetime.now(timezone.utc)
-        self.id = uuid.uuid4()
-        self.fecha_creacion = now
-        self.fecha_actualizacion = now
-        self.nombre = nombre
-        self.nit = nit
-        self.id_vendedor = uuid.UUID(id_vendedor) if isinstance(id_vendedor, str) else id_vendedor
-        self.logo_url = logo_url
-        self.address = address
-
-    def to_dict(self):
-        return {
-            "id": str(self.id),
-            "nombre": self.nombre,
-            "nit": self.nit,
-            "logoUrl": self.logo_url,
-            "address": self.address,
-            "fecha_creacion": self.fecha_creacion.isoformat() if self.fecha_creacion else None,
-            "fecha_actualizacion": self.fecha_actualizacion.isoformat() if self.fecha_actualizacion else None,
-            "id_vendedor": str(self.id_vendedor)
-        }
+    @validates("id_vendedor")
+    def _validate_id_vendedor(self, key, id_vendedor):
+        # id, fecha_creacion y fecha_actualizacion los asignan los defaults de columna al hacer flush
+        return uuid.UUID(id_vendedor) if isinstance(id_vendedor, str) else id_vendedor
@@ -1,23 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, status
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import Optional, List
+from functools import lru_cache
+import hashlib
 import logging
+import uuid
 from schemas.cliente_schema import ClientResponse, RegisterRequest
 from db.database import get_db
 from db.redis_client import RedisClient
 from services.cliente_service import ClienteService
-from schemas.cliente_schema import ClienteAsignadoListResponse
+from schemas.cliente_schema import ClienteAsignadoListResponse, ClienteAsignadoResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/clientes", tags=["clientes"])
 
 
-def get_cliente_service(
-    db: Session = Depends(get_db),
-    redis_client: RedisClient = Depends(lambda: RedisClient())
-) -> ClienteService:
-    return ClienteService(db=db, redis_client=redis_client)
+class PydanticResponse(JSONResponse):
+    """
+    Respuesta que serializa un modelo Pydantic directamente a JSON (núcleo en Rust)
+
+    Evita el paso por jsonable_encoder y la revalidación contra response_model
+    que FastAPI aplica a los valores retornados por el endpoint.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(by_alias=True).encode()
+
+
+# Las listas cambian poco: el cliente puede reutilizar su copia unos segundos sin volver a preguntar
+ASIGNADOS_CACHE_CONTROL = "private, max-age=15"
+
+
+def etag_response(request: Request, body: bytes) -> Response:
+    """
+    Respuesta JSON con ETag débil calculado sobre el cuerpo ya serializado
+
+    Si el cliente envía If-None-Match con el mismo ETag se responde 304 sin cuerpo.
+    """
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": ASIGNADOS_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> RedisClient:
+    """Cliente Redis compartido por todas las peticiones (un único pool de conexiones)"""
+    return RedisClient()
+
+
+def get_cliente_service(db: Session = Depends(get_db)) -> ClienteService:
+    """
+    Servicio de clientes para la petición actual
+
+    El estado costoso (cliente Redis, cliente HTTP, caches en memoria) vive a nivel de proceso;
+    por petición solo se asocia la sesión de base de datos, que no se puede compartir entre hilos.
+    """
+    return ClienteService(db=db, redis_client=get_redis_client())
 
 @router.get(
     "/",
@@ -29,10 +73,16 @@ def get_clientes(
     db: Session = Depends(get_db),
     client_service: ClienteService = Depends(get_cliente_service)
 ):
-    return client_service.get_all_clients(db)
+    return Response(content=client_service.get_all_clients(db), media_type="application/json")
 
 # ... (el resto del código del archivo cliente_router.py)
 
+@lru_cache(maxsize=1024)
+def _parse_vendedor_id(token: str) -> str:
+    """Valida que el token sea el UUID de un vendedor; los tokens repetidos no se vuelven a parsear"""
+    return str(uuid.UUID(token))
+
+
 def get_vendedor_id_from_auth(authorization: Optional[str] = Header(None)) -> str:
 
     if not authorization:
@@ -43,20 +93,17 @@ def get_vendedor_id_from_auth(authorization: Optional[str] = Header(None)) -> st
     
     # TODO: Implementar validación real del JWT
 
+    token = authorization[7:] if authorization.startswith("Bearer ") else authorization
+
+    if not token:
+        raise HTTPException(
+            status_code=401,
+            detail="Token inválido o expirado"
+        )
+
     try:
-        token = authorization.replace("Bearer ", "")
-        
-        vendedor_id = token
-        
-        if not vendedor_id:
-            raise HTTPException(
-                status_code=401,
-                detail="Token inválido o expirado"
-            )
-            
-        return vendedor_id
-        
-    except Exception as e:
+        return _parse_vendedor_id(token)
+    except ValueError as e:
         logger.error(f"Error al procesar token de autorización: {str(e)}")
         raise HTTPException(
             status_code=401,
@@ -70,7 +117,8 @@ def get_vendedor_id_from_auth(authorization: Optional[str] = Header(None)) -> st
     summary="Obtener clientes asignados al vendedor autenticado",
     description="Retorna la lista de clientes institucionales asignados al vendedor autenticado"
 )
-async def get_clientes_asignados(
+def get_clientes_asignados(
+    request: Request,
     cliente_service: ClienteService = Depends(get_cliente_service),
     vendedor_id: str = Depends(get_vendedor_id_from_auth)
 ):
@@ -78,10 +126,10 @@ async def get_clientes_asignados(
     try:
         logger.info(f"Solicitando clientes asignados para vendedor: {vendedor_id}")
         
-        clientes_response = cliente_service.get_clientes_asignados(vendedor_id)
+        clientes_json = cliente_service.get_clientes_asignados_json(vendedor_id)
         
-        logger.info(f"Retornando {clientes_response.total} clientes para vendedor {vendedor_id}")
-        return clientes_response
+        logger.info(f"Retornando clientes asignados para vendedor {vendedor_id}")
+        return etag_response(request, clientes_json)
         
     except HTTPException:
         raise
@@ -95,10 +143,11 @@ async def get_clientes_asignados(
 
 @router.get(
     "/asignados/{cliente_id}",
+    response_model=ClienteAsignadoResponse,
     summary="Obtener un cliente específico asignado al vendedor",
     description="Retorna un cliente específico si está asignado al vendedor autenticado"
 )
-async def get_cliente_asignado(
+def get_cliente_asignado(
     cliente_id: str,
     cliente_service: ClienteService = Depends(get_cliente_service),
     vendedor_id: str = Depends(get_vendedor_id_from_auth)
@@ -116,7 +165,7 @@ async def get_cliente_asignado(
             )
         
         logger.info(f"Cliente {cliente_id} encontrado para vendedor {vendedor_id}")
-        return cliente
+        return PydanticResponse(content=cliente)
         
     except HTTPException:
         raise
@@ -154,4 +203,5 @@ def register(
         HTTPException 400: Si el cliente ya está registrado
     """
 
-    return client_service.register_client(db, register_data)
+    new_client = client_service.register_client(db, register_data)
+    return PydanticResponse(content=new_client, status_code=status.HTTP_201_CREATED)
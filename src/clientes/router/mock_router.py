@@ -2,8 +2,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from db.database import get_db, Base, engine
-from services.mock_data_service import MockDataService
+from services.mock_data_service import MOCK_VENDEDOR_IDS, MockDataService
+from services.cliente_service import ClienteService
+from router.cliente_router import get_cliente_service
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +17,33 @@ def get_mock_service(db: Session = Depends(get_db)) -> MockDataService:
     return MockDataService(db=db)
 
 
+# Los IDs de los vendedores mock son fijos: la respuesta se arma una sola vez al importar
+_VENDEDORES_RESPONSE = {
+    "vendedores": [
+        {
+            "numero": 1,
+            "id": MOCK_VENDEDOR_IDS[0],
+            "descripcion": "Vendedor con 3 clientes asignados"
+        },
+        {
+            "numero": 2,
+            "id": MOCK_VENDEDOR_IDS[1],
+            "descripcion": "Vendedor con 2 clientes asignados"
+        },
+        {
+            "numero": 3,
+            "id": MOCK_VENDEDOR_IDS[2],
+            "descripcion": "Vendedor con 2 clientes asignados"
+        }
+    ],
+    "ejemplo_uso": {
+        "descripcion": "Usa estos IDs en el header Authorization",
+        "header": "Authorization: Bearer {vendedor_id}",
+        "ejemplo_curl": f"curl -H 'Authorization: Bearer {MOCK_VENDEDOR_IDS[0]}' http://localhost:3010/api/clientes/asignados"
+    }
+}
+
+
 @router.post(
     "/init-db",
     summary="Inicializar base de datos",
@@ -48,11 +78,16 @@ async def create_mock_clientes(
         False, 
         description="Si es true, elimina todos los clientes existentes antes de crear los nuevos"
     ),
-    mock_service: MockDataService = Depends(get_mock_service)
+    mock_service: MockDataService = Depends(get_mock_service),
+    cliente_service: ClienteService = Depends(get_cliente_service)
 ):
     try:
         logger.info(f"Creando datos mock (clear_existing={clear_existing})...")
         result = mock_service.create_mock_data(clear_existing=clear_existing)
+        if clear_existing:
+            cliente_service.invalidate_all_caches()
+        else:
+            cliente_service.invalidate_caches(MOCK_VENDEDOR_IDS)
         logger.info(f"Datos mock creados: {result['estadisticas']}")
         return result
         
@@ -70,11 +105,13 @@ async def create_mock_clientes(
     description="Elimina todos los clientes de la base de datos"
 )
 async def clear_all_clientes(
-    mock_service: MockDataService = Depends(get_mock_service)
+    mock_service: MockDataService = Depends(get_mock_service),
+    cliente_service: ClienteService = Depends(get_cliente_service)
 ):
     try:
         logger.warning("Eliminando todos los clientes de la base de datos...")
         result = mock_service.clear_all_data()
+        cliente_service.invalidate_all_caches()
         logger.info(f"Clientes eliminados: {result['clientes_eliminados']}")
         return result
         
@@ -111,36 +148,8 @@ async def get_database_stats(
     summary="Obtener IDs de vendedores mock",
     description="Retorna la lista de IDs de vendedores disponibles para testing"
 )
-async def get_mock_vendedores(
-    mock_service: MockDataService = Depends(get_mock_service)
-):
-
-    vendedor_ids = mock_service.get_mock_vendedor_ids()
-    
-    return {
-        "vendedores": [
-            {
-                "numero": 1,
-                "id": vendedor_ids[0],
-                "descripcion": "Vendedor con 3 clientes asignados"
-            },
-            {
-                "numero": 2,
-                "id": vendedor_ids[1],
-                "descripcion": "Vendedor con 2 clientes asignados"
-            },
-            {
-                "numero": 3,
-                "id": vendedor_ids[2],
-                "descripcion": "Vendedor con 2 clientes asignados"
-            }
-        ],
-        "ejemplo_uso": {
-            "descripcion": "Usa estos IDs en el header Authorization",
-            "header": "Authorization: Bearer {vendedor_id}",
-            "ejemplo_curl": f"curl -H 'Authorization: Bearer {vendedor_ids[0]}' http://localhost:3010/api/clientes/asignados"
-        }
-    }
+async def get_mock_vendedores():
+    return _VENDEDORES_RESPONSE
 
 
 @router.post(
@@ -156,11 +165,14 @@ async def generate_clientes_for_vendedor(
         le=50,
         description="Cantidad de clientes a generar (entre 1 y 50)"
     ),
-    mock_service: MockDataService = Depends(get_mock_service)
+    mock_service: MockDataService = Depends(get_mock_service),
+    cliente_service: ClienteService = Depends(get_cliente_service)
 ):
     try:
         logger.info(f"Generando {cantidad} clientes para vendedor {vendedor_id}...")
         result = mock_service.generate_clientes_for_vendedor(vendedor_id, cantidad)
+        # Misma forma canónica del UUID con la que se arma la llave de cache en /asignados
+        cliente_service.invalidate_cache(str(uuid.UUID(vendedor_id)))
         logger.info(f"Clientes generados exitosamente: {result['clientes_generados']}")
         return result
         
@@ -1,21 +1,18 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import AliasChoices, BaseModel, BeforeValidator, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional
 from datetime import datetime
 
+# String sin espacios alrededor y no vacío; la validación corre en el núcleo de pydantic (Rust)
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+# Los UUID de las columnas del modelo se exponen como string
+UUIDStr = Annotated[str, BeforeValidator(str)]
+
 
 class ClienteAsignadoResponse(BaseModel):
-    id: str = Field(..., min_length=1, description="Identificador único del cliente")
-    nombre: str = Field(..., min_length=1, description="Nombre de la institución")
-    nit: str = Field(..., min_length=1, description="Número de identificación tributaria")
+    id: NonEmptyStr = Field(..., description="Identificador único del cliente")
+    nombre: NonEmptyStr = Field(..., description="Nombre de la institución")
+    nit: NonEmptyStr = Field(..., description="Número de identificación tributaria")
     logoUrl: Optional[str] = Field(None, description="URL del logo de la institución")
-    
-    @field_validator('id', 'nombre', 'nit')
-    @classmethod
-    def validate_not_empty(cls, v: str, info) -> str:
-        """Valida que los campos no sean strings vacíos"""
-        if not v or not v.strip():
-            raise ValueError(f'{info.field_name} no puede estar vacío')
-        return v.strip()
 
     class Config:
         json_schema_extra = {
@@ -75,16 +72,22 @@ class ClientResponse(BaseModel):
 
 
     """
-    id: str = Field(..., description="Id del cliente institucional")
+    id: UUIDStr = Field(..., description="Id del cliente institucional")
     nombre: str = Field(..., description="Nombre del cliente institucional")
-    logoUrl: str = Field(..., description="URL del logo del cliente institucional")
+    logoUrl: str = Field(
+        ...,
+        validation_alias=AliasChoices("logoUrl", "logo_url"),
+        description="URL del logo del cliente institucional"
+    )
     address: str = Field(..., description="Dirección del cliente institucional")
     fecha_creacion: datetime = Field(..., description=  "Fecha de creación")
     fecha_actualizacion: datetime = Field(..., description="Fecha de última actualización")
-    id_vendedor: Optional[str] = Field(None, description="Id del vendedor asignado")
+    id_vendedor: Optional[UUIDStr] = Field(None, description="Id del vendedor asignado")
 
-    model_config = {
-        "json_schema_extra": {
+    # from_attributes: se construye directamente desde ClienteInstitucional con model_validate
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "examples": [
                 {
                     "id": "c123e4567-e89b-12d3-a456-426614174000",
@@ -97,7 +100,7 @@ class ClientResponse(BaseModel):
                 }
             ]
         }
-    }
+    )
 
 class RegisterRequest(BaseModel):
     """
@@ -1,14 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam, select
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 import logging
+import threading
+import time
+import orjson
+from cachetools import TTLCache
+from pydantic import TypeAdapter
 from db.redis_client import RedisClient
 from models.cliente_institucional_model import ClienteInstitucional
 from schemas.cliente_schema import ClienteAsignadoResponse, ClienteAsignadoListResponse, ClientResponse
-import json
 from schemas.cliente_schema import RegisterRequest
 import httpx  
 import random  
@@ -16,29 +20,159 @@ import random
 AUTENTICACION_PATH = os.getenv("AUTENTICACION_SERVICE_URL", "http://autenticacion-service:3000")
 logger = logging.getLogger(__name__)
 
+# Cliente compartido hacia autenticación: reutiliza conexiones (keep-alive, HTTP/2) entre registros
+_AUTH_CLIENT = httpx.Client(
+    base_url=AUTENTICACION_PATH,
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+)
+
+
+SELLERS_CACHE_KEY = "auth:sellers"
+# Los vendedores activos cambian poco: se cachean por SELLERS_TTL segundos y, cuando a la copia
+# local le quedan menos de SELLERS_REFRESH_AHEAD, se refresca en segundo plano mientras se sigue
+# sirviendo la actual (stale-while-revalidate)
+SELLERS_TTL = 45
+SELLERS_REFRESH_AHEAD = 10
+
+_SELLERS_STATE = {"sellers": None, "fetched_at": 0.0, "refreshing": False}
+_SELLERS_LOCK = threading.Lock()
+
+
+def close_client() -> None:
+    """Cierra el cliente HTTP compartido hacia el servicio de autenticación"""
+    _AUTH_CLIENT.close()
+
+# Columnas que se leen como tuplas (sin hidratar objetos ORM) en los endpoints de lectura
+_CLIENTE_COLUMNS = (
+    ClienteInstitucional.id,
+    ClienteInstitucional.nombre,
+    ClienteInstitucional.nit,
+    ClienteInstitucional.logo_url,
+    ClienteInstitucional.address,
+    ClienteInstitucional.fecha_creacion,
+    ClienteInstitucional.fecha_actualizacion,
+    ClienteInstitucional.id_vendedor,
+)
+_ASIGNADO_COLUMNS = (
+    ClienteInstitucional.id,
+    ClienteInstitucional.nombre,
+    ClienteInstitucional.nit,
+    ClienteInstitucional.logo_url,
+)
+
+# Serializa la lista completa en una sola pasada de pydantic-core, sin el modelo contenedor
+_ASIGNADOS_ADAPTER = TypeAdapter(list[ClienteAsignadoResponse])
+
+# Sentencias construidas una sola vez con parámetros de enlace: cada llamada solo pasa los valores
+# y SQLAlchemy reutiliza el SQL ya compilado de su cache, sin reconstruir el select()
+_SELECT_CLIENTES = select(*_CLIENTE_COLUMNS).execution_options(yield_per=500)
+_SELECT_ASIGNADOS = select(*_ASIGNADO_COLUMNS).where(
+    ClienteInstitucional.id_vendedor == bindparam("vendedor_id")
+)
+_SELECT_ASIGNADOS_BULK = select(ClienteInstitucional.id_vendedor, *_ASIGNADO_COLUMNS).where(
+    ClienteInstitucional.id_vendedor.in_(bindparam("vendedor_ids", expanding=True))
+)
+_SELECT_ASIGNADO = select(*_ASIGNADO_COLUMNS).where(
+    and_(
+        ClienteInstitucional.id == bindparam("cliente_id"),
+        ClienteInstitucional.id_vendedor == bindparam("vendedor_id")
+    )
+)
+
+CACHE_INVALIDATION_CHANNEL = "cache:clientes:invalidate"
+
+# Al expirar la llave de un vendedor, solo el worker que toma el lock (SET NX) consulta la base de
+# datos; los demás esperan a que el cache se repueble, hasta STAMPEDE_MAX_WAITS * STAMPEDE_WAIT segundos
+STAMPEDE_LOCK_TTL = 5
+STAMPEDE_WAIT = 0.02
+STAMPEDE_MAX_WAITS = 10
+
+# Copia en memoria del proceso delante de Redis: los vendedores frecuentes no pagan el RTT.
+# Las invalidaciones llegan por pub/sub (ver start_cache_invalidation_listener) y el TTL acota
+# lo que pueda quedar desactualizado si se pierde un mensaje
+_LOCAL_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_LOCAL_CACHE_LOCK = threading.Lock()
+# Versión ya parseada de cada entrada local, para no repetir orjson.loads en cada hit. Solo vale
+# mientras la entrada de _LOCAL_CACHE siga siendo el mismo objeto, así que hereda sus invalidaciones
+_PARSED_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
+CACHE_NAMESPACE = "clientes_asignados:"
+# Mensaje de invalidación que descarta las copias locales de todos los vendedores
+INVALIDATE_ALL = "*"
+
+
+def _cache_key(vendedor_id: str) -> str:
+    return f"{CACHE_NAMESPACE}{vendedor_id}"
+
+
+def _evict_local(vendedor_id: str) -> None:
+    with _LOCAL_CACHE_LOCK:
+        _LOCAL_CACHE.pop(_cache_key(vendedor_id), None)
+
+
+def _asignados_json(clientes: List[ClienteAsignadoResponse]) -> bytes:
+    """JSON de ClienteAsignadoListResponse armado a mano alrededor de la lista serializada"""
+    return b'{"clientes":' + _ASIGNADOS_ADAPTER.dump_json(clientes) + b',"total":' + str(len(clientes)).encode() + b'}'
+
+
+def _list_from_dict(data: dict) -> ClienteAsignadoListResponse:
+    # El JSON cacheado lo produce este mismo servicio: se rehidrata sin revalidar
+    return ClienteAsignadoListResponse.model_construct(
+        clientes=[ClienteAsignadoResponse.model_construct(**cliente) for cliente in data["clientes"]],
+        total=data["total"]
+    )
+
+
+def _on_cache_invalidation(message) -> None:
+    vendedor_id = message["data"]
+    vendedor_id = vendedor_id.decode() if isinstance(vendedor_id, bytes) else vendedor_id
+    if vendedor_id == INVALIDATE_ALL:
+        with _LOCAL_CACHE_LOCK:
+            _LOCAL_CACHE.clear()
+        return
+    _evict_local(vendedor_id)
+
+
+def start_cache_invalidation_listener(redis_client: RedisClient):
+    """
+    Suscribe el proceso al canal de invalidación para descartar su copia local del cache
+
+    Returns:
+        El hilo del listener (con stop()), o None si Redis no está disponible
+    """
+    if not redis_client.is_connected():
+        return None
+    pubsub = redis_client.client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(**{CACHE_INVALIDATION_CHANNEL: _on_cache_invalidation})
+    return pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
 
 class ClienteService:
     def __init__(self, db: Session, redis_client: RedisClient):
         self.db = db
         self.redis_client = redis_client
 
-    def get_all_clients(self, db: Session) -> List[ClientResponse]:
-        try:
-            clientes_db = db.query(ClienteInstitucional).all()
-            clientes_response = [
-                ClientResponse(
-                    id=str(cliente.id),
-                    nombre=cliente.nombre,
-                    nit=cliente.nit,
-                    logoUrl=cliente.logo_url,
-                    address=cliente.address,
-                    fecha_creacion=cliente.fecha_creacion,
-                    fecha_actualizacion=cliente.fecha_actualizacion,
-                    id_vendedor=str(cliente.id_vendedor) if cliente.id_vendedor else None
-                )
+    def get_all_clients(self, db: Session) -> bytes:
+        """Lista de todos los clientes serializada a JSON (mismo formato de ClientResponse)"""
+        try:
+            clientes_db = db.execute(_SELECT_CLIENTES)
+            # Endpoint de solo lectura: las filas van directo a orjson, sin instanciar modelos Pydantic
+            return orjson.dumps([
+                {
+                    "id": str(cliente.id),
+                    "nombre": cliente.nombre,
+                    "nit": cliente.nit,
+                    "logoUrl": cliente.logo_url,
+                    "address": cliente.address,
+                    "fecha_creacion": cliente.fecha_creacion,
+                    "fecha_actualizacion": cliente.fecha_actualizacion,
+                    "id_vendedor": str(cliente.id_vendedor) if cliente.id_vendedor else None
+                }
                 for cliente in clientes_db
-            ]
-            return clientes_response
+            ])
         except Exception as e:
             logger.error(f"Error al obtener lista de clientes: {str(e)}")
             raise
@@ -53,59 +187,201 @@ class ClienteService:
                     logger.info(f"Clientes obtenidos desde cache para vendedor {vendedor_id}")
                     return cached_data
 
-            clientes_db = self.db.query(ClienteInstitucional).filter(
-                ClienteInstitucional.id_vendedor == vendedor_id
-            ).all()
-
-            clientes_response = [
-                ClienteAsignadoResponse(
-                    id=str(cliente.id),
-                    nombre=cliente.nombre,
-                    nit=cliente.nit,
-                    logoUrl=cliente.logo_url
-                )
-                for cliente in clientes_db
-            ]
+            clientes_response = self._query_clientes_asignados(vendedor_id)
 
-            response = ClienteAsignadoListResponse(
+            response = ClienteAsignadoListResponse.model_construct(
                 clientes=clientes_response,
                 total=len(clientes_response)
             )
 
             if use_cache:
-                self._save_to_cache(vendedor_id, response)
+                self._save_to_cache(vendedor_id, _asignados_json(clientes_response))
 
-            logger.info(f"Se encontraron {len(clientes_response)} clientes para vendedor {vendedor_id}")
             return response
 
         except Exception as e:
             logger.error(f"Error al obtener clientes asignados para vendedor {vendedor_id}: {str(e)}")
             raise
 
-    def _get_from_cache(self, vendedor_id: str) -> Optional[ClienteAsignadoListResponse]:
+    def get_clientes_asignados_bulk(self, vendedor_ids: List[str]) -> Dict[str, ClienteAsignadoListResponse]:
+        """
+        Clientes asignados de varios vendedores (p. ej. para precalentar el cache)
+
+        Un MGET a Redis para todos y una sola consulta IN para los que no estén cacheados,
+        que luego se guardan en un solo round-trip.
+
+        Args:
+            vendedor_ids: UUIDs de los vendedores en forma canónica
+
+        Returns:
+            Diccionario vendedor_id -> lista de clientes asignados
+        """
+        cached = {}
+        try:
+            if vendedor_ids and self.redis_client.is_connected():
+                cached = dict(zip(vendedor_ids, self.redis_client.mget_json([_cache_key(v) for v in vendedor_ids])))
+        except Exception as e:
+            logger.warning(f"Error al obtener datos del cache: {str(e)}")
+
+        response = {
+            vendedor_id: _list_from_dict(orjson.loads(data))
+            for vendedor_id, data in cached.items()
+            if data
+        }
+        faltantes = [vendedor_id for vendedor_id in vendedor_ids if vendedor_id not in response]
+        if not faltantes:
+            return response
+
+        try:
+            clientes_por_vendedor = {vendedor_id: [] for vendedor_id in faltantes}
+            clientes_db = self.db.execute(_SELECT_ASIGNADOS_BULK, {"vendedor_ids": faltantes}).all()
+            for id_vendedor, cliente_id, nombre, nit, logo_url in clientes_db:
+                clientes_por_vendedor[str(id_vendedor)].append(
+                    ClienteAsignadoResponse.model_construct(
+                        id=str(cliente_id),
+                        nombre=nombre,
+                        nit=nit,
+                        logoUrl=logo_url
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Error al obtener clientes asignados para vendedores {', '.join(faltantes)}: {str(e)}")
+            raise
+
+        por_guardar = {}
+        for vendedor_id, clientes in clientes_por_vendedor.items():
+            response[vendedor_id] = ClienteAsignadoListResponse.model_construct(clientes=clientes, total=len(clientes))
+            por_guardar[_cache_key(vendedor_id)] = _asignados_json(clientes)
+
+        with _LOCAL_CACHE_LOCK:
+            _LOCAL_CACHE.update(por_guardar)
+        try:
+            if self.redis_client.is_connected():
+                self.redis_client.mset_json(por_guardar, ttl=300)
+        except Exception as e:
+            logger.warning(f"Error al guardar datos en cache: {str(e)}")
+
+        return response
+
+    def get_clientes_asignados_json(self, vendedor_id: str) -> bytes:
+        """Lista de clientes asignados ya serializada; en cache hit se retorna tal cual, sin instanciar modelos"""
+        cached_json = self._get_cached_json(vendedor_id)
+        if cached_json:
+            logger.info(f"Clientes obtenidos desde cache para vendedor {vendedor_id}")
+            return cached_json.encode() if isinstance(cached_json, str) else cached_json
+
+        lock_key = f"{_cache_key(vendedor_id)}:lock"
+        locked = self._acquire_lock(lock_key)
+        waits = 0
+        while not locked and waits < STAMPEDE_MAX_WAITS:
+            time.sleep(STAMPEDE_WAIT)
+            waits += 1
+            cached_json = self._get_cached_json(vendedor_id)
+            if cached_json:
+                logger.info(f"Clientes obtenidos desde cache para vendedor {vendedor_id} tras esperar el lock")
+                return cached_json.encode() if isinstance(cached_json, str) else cached_json
+            locked = self._acquire_lock(lock_key)
+
+        try:
+            clientes_response = self._query_clientes_asignados(vendedor_id)
+            data_json = _asignados_json(clientes_response)
+            self._save_to_cache(vendedor_id, data_json)
+            return data_json
+        except Exception as e:
+            logger.error(f"Error al obtener clientes asignados para vendedor {vendedor_id}: {str(e)}")
+            raise
+        finally:
+            if locked:
+                self._release_lock(lock_key)
+
+    def _acquire_lock(self, lock_key: str) -> bool:
+        # Sin Redis no hay con quién coordinarse: el worker consulta directamente
+        try:
+            if not self.redis_client.is_connected():
+                return True
+            return bool(self.redis_client.client.set(lock_key, "1", nx=True, ex=STAMPEDE_LOCK_TTL))
+        except Exception as e:
+            logger.warning(f"Error al tomar el lock de cache: {str(e)}")
+            return True
+
+    def _release_lock(self, lock_key: str) -> None:
+        try:
+            if self.redis_client.is_connected():
+                self.redis_client.client.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Error al liberar el lock de cache: {str(e)}")
+
+    def _query_clientes_asignados(self, vendedor_id: str) -> List[ClienteAsignadoResponse]:
+        clientes_db = self.db.execute(_SELECT_ASIGNADOS, {"vendedor_id": vendedor_id}).all()
+
+        # Los datos vienen de la base de datos (ya confiables): model_construct evita revalidarlos
+        clientes_response = [
+            ClienteAsignadoResponse.model_construct(
+                id=str(cliente_id),
+                nombre=nombre,
+                nit=nit,
+                logoUrl=logo_url
+            )
+            for cliente_id, nombre, nit, logo_url in clientes_db
+        ]
+        logger.info(f"Se encontraron {len(clientes_response)} clientes para vendedor {vendedor_id}")
+        return clientes_response
+
+    def _get_cached_json(self, vendedor_id: str) -> Optional[Union[str, bytes]]:
+        cache_key = _cache_key(vendedor_id)
+        with _LOCAL_CACHE_LOCK:
+            local_data = _LOCAL_CACHE.get(cache_key)
+        if local_data is not None:
+            return local_data
+
         try:
             if not self.redis_client.is_connected():
                 return None
 
-            cache_key = f"clientes_asignados:{vendedor_id}"
             cached_data = self.redis_client.client.get(cache_key)
-            
             if cached_data:
-                data_dict = json.loads(cached_data)
-                return ClienteAsignadoListResponse(**data_dict)
-            
+                with _LOCAL_CACHE_LOCK:
+                    _LOCAL_CACHE[cache_key] = cached_data
+            return cached_data
+        except Exception as e:
+            logger.warning(f"Error al obtener datos del cache: {str(e)}")
             return None
+
+    def _get_cached_dict(self, vendedor_id: str) -> Optional[dict]:
+        cached_data = self._get_cached_json(vendedor_id)
+        if not cached_data:
+            return None
+
+        cache_key = _cache_key(vendedor_id)
+        with _LOCAL_CACHE_LOCK:
+            parsed = _PARSED_CACHE.get(cache_key)
+        if parsed is not None and parsed[0] is cached_data:
+            return parsed[1]
+
+        try:
+            data = orjson.loads(cached_data)
         except Exception as e:
             logger.warning(f"Error al obtener datos del cache: {str(e)}")
             return None
 
-    def _save_to_cache(self, vendedor_id: str, data: ClienteAsignadoListResponse, ttl: int = 300):
+        with _LOCAL_CACHE_LOCK:
+            _PARSED_CACHE[cache_key] = (cached_data, data)
+        return data
+
+    def _get_from_cache(self, vendedor_id: str) -> Optional[ClienteAsignadoListResponse]:
+        data = self._get_cached_dict(vendedor_id)
+        if data is None:
+            return None
+        return _list_from_dict(data)
+
+    def _save_to_cache(self, vendedor_id: str, data_json: Union[str, bytes], ttl: int = 300):
+        cache_key = _cache_key(vendedor_id)
+        with _LOCAL_CACHE_LOCK:
+            _LOCAL_CACHE[cache_key] = data_json
+
         try:
             if not self.redis_client.is_connected():
                 return
-
-            cache_key = f"clientes_asignados:{vendedor_id}"
-            data_json = data.model_dump_json()
             
             self.redis_client.client.setex(cache_key, ttl, data_json)
             logger.info(f"Datos guardados en cache para vendedor {vendedor_id} con TTL {ttl}s")
@@ -114,35 +390,68 @@ class ClienteService:
             logger.warning(f"Error al guardar datos en cache: {str(e)}")
 
     def invalidate_cache(self, vendedor_id: str):
+        self.invalidate_caches([vendedor_id])
+
+    def invalidate_caches(self, vendedor_ids) -> None:
+        """Invalida la lista cacheada de varios vendedores (local, Redis y demás procesos)"""
+        for vendedor_id in vendedor_ids:
+            _evict_local(vendedor_id)
+
         try:
             if not self.redis_client.is_connected():
                 return
 
-            cache_key = f"clientes_asignados:{vendedor_id}"
-            self.redis_client.client.delete(cache_key)
-            logger.info(f"Cache invalidado para vendedor {vendedor_id}")
+            # Borrado y aviso a los demás procesos en un solo round-trip
+            pipeline = self.redis_client.client.pipeline()
+            for vendedor_id in vendedor_ids:
+                pipeline.delete(_cache_key(vendedor_id))
+                pipeline.publish(CACHE_INVALIDATION_CHANNEL, vendedor_id)
+            pipeline.execute()
+            logger.info(f"Cache invalidado para vendedores {', '.join(vendedor_ids)}")
             
         except Exception as e:
             logger.warning(f"Error al invalidar cache: {str(e)}")
 
+    def invalidate_all_caches(self) -> None:
+        """Invalida la lista cacheada de todos los vendedores (p. ej. tras borrar todos los clientes)"""
+        with _LOCAL_CACHE_LOCK:
+            _LOCAL_CACHE.clear()
+
+        try:
+            if not self.redis_client.is_connected():
+                return
+
+            deleted = self.redis_client.invalidate_namespace(CACHE_NAMESPACE)
+            self.redis_client.client.publish(CACHE_INVALIDATION_CHANNEL, INVALIDATE_ALL)
+            logger.info(f"Cache invalidado para todos los vendedores ({deleted} llaves)")
+
+        except Exception as e:
+            logger.warning(f"Error al invalidar cache: {str(e)}")
+
     def get_cliente_by_id(self, cliente_id: str, vendedor_id: str) -> Optional[ClienteAsignadoResponse]:
 
         try:
-            cliente_db = self.db.query(ClienteInstitucional).filter(
-                and_(
-                    ClienteInstitucional.id == cliente_id,
-                    ClienteInstitucional.id_vendedor == vendedor_id
-                )
+            # Si la lista del vendedor está en cache se responde sin tocar la base de datos
+            cached_data = self._get_cached_dict(vendedor_id)
+            if cached_data:
+                for cliente in cached_data["clientes"]:
+                    if cliente["id"] == cliente_id:
+                        logger.info(f"Cliente {cliente_id} obtenido desde cache para vendedor {vendedor_id}")
+                        return ClienteAsignadoResponse.model_construct(**cliente)
+
+            cliente_db = self.db.execute(
+                _SELECT_ASIGNADO, {"cliente_id": cliente_id, "vendedor_id": vendedor_id}
             ).first()
 
             if not cliente_db:
                 return None
 
-            return ClienteAsignadoResponse(
-                id=str(cliente_db.id),
-                nombre=cliente_db.nombre,
-                nit=cliente_db.nit,
-                logoUrl=cliente_db.logo_url
+            db_cliente_id, nombre, nit, logo_url = cliente_db
+            return ClienteAsignadoResponse.model_construct(
+                id=str(db_cliente_id),
+                nombre=nombre,
+                nit=nit,
+                logoUrl=logo_url
             )
 
         except Exception as e:
@@ -150,12 +459,65 @@ class ClienteService:
             raise
 
     # 🚀 Aquí es donde cambiamos la lógica
+    def _get_sellers(self) -> list:
+        """Vendedores activos: memoria del proceso -> Redis -> servicio de autenticación"""
+        with _SELLERS_LOCK:
+            sellers = _SELLERS_STATE["sellers"]
+            age = time.monotonic() - _SELLERS_STATE["fetched_at"]
+            if sellers is not None and age < SELLERS_TTL:
+                if age > SELLERS_TTL - SELLERS_REFRESH_AHEAD and not _SELLERS_STATE["refreshing"]:
+                    _SELLERS_STATE["refreshing"] = True
+                    threading.Thread(target=self._refresh_sellers, daemon=True).start()
+                return sellers
+
+        sellers = self._get_sellers_from_redis()
+        if sellers is not None:
+            self._set_local_sellers(sellers)
+            return sellers
+
+        return self._fetch_sellers()
+
+    def _fetch_sellers(self) -> list:
+        response = _AUTH_CLIENT.get("/auth/sellers")
+        response.raise_for_status()
+        sellers = response.json()
+        self._set_local_sellers(sellers)
+        try:
+            if self.redis_client.is_connected():
+                self.redis_client.client.setex(SELLERS_CACHE_KEY, SELLERS_TTL, orjson.dumps(sellers))
+        except Exception as e:
+            logger.warning(f"Error al guardar vendedores en cache: {str(e)}")
+        return sellers
+
+    def _refresh_sellers(self) -> None:
+        try:
+            self._fetch_sellers()
+        except Exception as e:
+            logger.warning(f"Error al refrescar vendedores activos: {str(e)}")
+        finally:
+            with _SELLERS_LOCK:
+                _SELLERS_STATE["refreshing"] = False
+
+    def _get_sellers_from_redis(self) -> Optional[list]:
+        try:
+            if not self.redis_client.is_connected():
+                return None
+            cached_data = self.redis_client.client.get(SELLERS_CACHE_KEY)
+            return orjson.loads(cached_data) if cached_data else None
+        except Exception as e:
+            logger.warning(f"Error al obtener vendedores del cache: {str(e)}")
+            return None
+
+    @staticmethod
+    def _set_local_sellers(sellers: list) -> None:
+        with _SELLERS_LOCK:
+            _SELLERS_STATE["sellers"] = sellers
+            _SELLERS_STATE["fetched_at"] = time.monotonic()
+
     def register_client(self, db: Session, register_data: RegisterRequest) -> ClientResponse: 
-        # 1️⃣ Llamar al servicio de autenticación para traer los vendedores activos
+        # 1️⃣ Traer los vendedores activos (cacheados; solo se llama a autenticación si expiraron)
         try:
-            response = httpx.get(f"{AUTENTICACION_PATH}/auth/sellers", timeout=10.0)
-            response.raise_for_status()
-            sellers = response.json()
+            sellers = self._get_sellers()
         except Exception as e:
             logger.error(f"Error al obtener vendedores activos: {e}")
             raise HTTPException(
@@ -182,8 +544,9 @@ class ClienteService:
             db.add(new_client)
             db.commit()
             db.refresh(new_client)
-            user_dict = new_client.to_dict()
-            return ClientResponse(**user_dict)
+            # Tras el commit: la lista cacheada del vendedor ya no incluye al nuevo cliente
+            self.invalidate_cache(str(new_client.id_vendedor))
+            return ClientResponse.model_validate(new_client)
 
         except IntegrityError:
             db.rollback()
@@ -191,12 +554,3 @@ class ClienteService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El nit ya está registrado"
             )
-
-def get_client_service() -> ClienteService:
-    """
-    Función de dependencia para inyectar el servicio de cliente
-
-    Returns:
-        AuthService: Instancia del servicio de cleinte
-    """
-    return ClienteService()
\ No newline at end of file
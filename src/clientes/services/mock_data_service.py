@@ -1,11 +1,22 @@
 """
 Servicio para generar datos mock del servicio de clientes.
 """
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 from models.cliente_institucional_model import ClienteInstitucional
 from typing import Dict, List
 import uuid
 
+MOCK_VENDEDOR_IDS = (
+    "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+    "b2c3d4e5-f6a7-8901-bcde-f12345678901",
+    "c3d4e5f6-a7b8-9012-cdef-123456789012",
+)
+
+# Los mismos IDs ya parseados, para no convertir el string en cada fila o consulta
+MOCK_VENDEDOR_UUIDS = tuple(uuid.UUID(vendedor_id) for vendedor_id in MOCK_VENDEDOR_IDS)
+
 
 class MockDataService:
 
@@ -13,14 +24,10 @@ class MockDataService:
         self.db = db
     
     def get_mock_vendedor_ids(self) -> List[str]:
-        return [
-            "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
-            "b2c3d4e5-f6a7-8901-bcde-f12345678901",
-            "c3d4e5f6-a7b8-9012-cdef-123456789012",
-        ]
+        return list(MOCK_VENDEDOR_IDS)
     
     def get_mock_clientes_data(self) -> List[Dict]:
-        vendedor_ids = self.get_mock_vendedor_ids()
+        vendedor_ids = MOCK_VENDEDOR_UUIDS
         
         return [
             {
@@ -73,41 +80,53 @@ class MockDataService:
             clientes_eliminados = 0
             
             if clear_existing:
-                clientes_eliminados = self.db.query(ClienteInstitucional).count()
-                self.db.query(ClienteInstitucional).delete()
-                self.db.commit()
+                # delete() retorna las filas borradas; el borrado se confirma junto con los inserts
+                clientes_eliminados = self.db.query(ClienteInstitucional).delete()
             
             clientes_data = self.get_mock_clientes_data()
             
-            clientes_creados = 0
-            clientes_saltados = 0
-            clientes_info = []
+            columnas = (
+                ClienteInstitucional.id,
+                ClienteInstitucional.nombre,
+                ClienteInstitucional.nit,
+                ClienteInstitucional.id_vendedor
+            )
             
-            for cliente_data in clientes_data:
-                existing = self.db.query(ClienteInstitucional).filter_by(
-                    nit=cliente_data["nit"]
-                ).first()
-                
-                if not existing:
-                    cliente = ClienteInstitucional(**cliente_data)
-                    self.db.add(cliente)
-                    clientes_creados += 1
-                    clientes_info.append({
-                        "id": str(cliente.id),
-                        "nombre": cliente.nombre,
-                        "nit": cliente.nit,
-                        "id_vendedor": str(cliente.id_vendedor),
-                        "estado": "creado"
-                    })
-                else:
-                    clientes_saltados += 1
-                    clientes_info.append({
-                        "id": str(existing.id),
-                        "nombre": existing.nombre,
-                        "nit": existing.nit,
-                        "id_vendedor": str(existing.id_vendedor),
-                        "estado": "ya_existia"
-                    })
+            # Una sola consulta IN para saber cuáles NIT ya existen y un único INSERT multi-fila para el resto
+            existentes = {
+                cliente.nit: cliente
+                for cliente in self.db.execute(
+                    select(*columnas).where(
+                        ClienteInstitucional.nit.in_([cliente_data["nit"] for cliente_data in clientes_data])
+                    )
+                )
+            }
+            nuevos = [cliente_data for cliente_data in clientes_data if cliente_data["nit"] not in existentes]
+            creados = {}
+            if nuevos:
+                creados = {
+                    cliente.nit: cliente
+                    for cliente in self.db.execute(
+                        insert(ClienteInstitucional).values(nuevos).returning(*columnas)
+                    )
+                }
+            
+            clientes_creados = len(creados)
+            clientes_saltados = len(existentes)
+            clientes_info = [
+                {
+                    "id": str(cliente.id),
+                    "nombre": cliente.nombre,
+                    "nit": cliente.nit,
+                    "id_vendedor": str(cliente.id_vendedor),
+                    "estado": estado
+                }
+                for cliente, estado in (
+                    (creados[cliente_data["nit"]], "creado") if cliente_data["nit"] in creados
+                    else (existentes[cliente_data["nit"]], "ya_existia")
+                    for cliente_data in clientes_data
+                )
+            ]
             
             self.db.commit()
             
@@ -132,8 +151,7 @@ class MockDataService:
     
     def clear_all_data(self) -> Dict:
         try:
-            count = self.db.query(ClienteInstitucional).count()
-            self.db.query(ClienteInstitucional).delete()
+            count = self.db.query(ClienteInstitucional).delete()
             self.db.commit()
             
             return {
@@ -148,16 +166,19 @@ class MockDataService:
     
     def get_stats(self) -> Dict:
         try:
-            total_clientes = self.db.query(ClienteInstitucional).count()
+            # Un solo GROUP BY sobre todos los vendedores: el total sale de la suma y los conteos de
+            # los vendedores mock del mismo resultado (no todos los clientes son de vendedores mock)
+            conteos = dict(self.db.execute(
+                select(ClienteInstitucional.id_vendedor, func.count())
+                .group_by(ClienteInstitucional.id_vendedor)
+            ).all())
+            total_clientes = sum(conteos.values())
             
             vendedores_mock = self.get_mock_vendedor_ids()
-            clientes_por_vendedor = {}
-            
-            for vendedor_id in vendedores_mock:
-                count = self.db.query(ClienteInstitucional).filter_by(
-                    id_vendedor=uuid.UUID(vendedor_id)
-                ).count()
-                clientes_por_vendedor[vendedor_id] = count
+            clientes_por_vendedor = {
+                vendedor_id: conteos.get(vendedor_uuid, 0)
+                for vendedor_id, vendedor_uuid in zip(vendedores_mock, MOCK_VENDEDOR_UUIDS)
+            }
             
             return {
                 "total_clientes": total_clientes,
@@ -195,46 +216,61 @@ class MockDataService:
                 "de la Mujer", "de Especialidades", "Integral"
             ]
             
-            clientes_generados = []
-            clientes_creados = 0
-            intentos_fallidos = 0
-            max_intentos = cantidad * 3
+            # Se generan los NIT únicos de una vez; con ~10^10 combinaciones las colisiones son raras,
+            # así que solo se regeneran los que ya existan (una consulta IN por tanda)
+            nits = set()
+            pendientes = cantidad
+            while pendientes:
+                candidatos = set()
+                while len(candidatos) < pendientes:
+                    nit = f"{random.randint(800000000, 999999999)}-{random.randint(0, 9)}"
+                    if nit not in nits:
+                        candidatos.add(nit)
+                existentes = set(self.db.scalars(
+                    select(ClienteInstitucional.nit).where(ClienteInstitucional.nit.in_(candidatos))
+                ))
+                nits |= candidatos - existentes
+                pendientes = len(existentes)
             
-            while clientes_creados < cantidad and intentos_fallidos < max_intentos:
-                tipo = random.choice(tipos_instituciones)
-                nombre_base = random.choice(nombres)
-                nombre_completo = f"{tipo} {nombre_base}"
-                
-                nit_numero = random.randint(800000000, 999999999)
-                nit_verificacion = random.randint(0, 9)
-                nit = f"{nit_numero}-{nit_verificacion}"
-                
-                existing = self.db.query(ClienteInstitucional).filter_by(nit=nit).first()
-                
-                if not existing:
-                    logo_url = None
-                    if random.random() < 0.7:
-                        logo_slug = nombre_completo.lower().replace(" ", "-")
-                        logo_url = f"https://storage.googleapis.com/logos/{logo_slug}.png"
-                    
-                    cliente = ClienteInstitucional(
-                        nombre=nombre_completo,
-                        nit=nit,
-                        id_vendedor=vendedor_id,
-                        logo_url=logo_url
+            nombres_completos = [
+                f"{random.choice(tipos_instituciones)} {random.choice(nombres)}" for _ in range(cantidad)
+            ]
+            filas = [
+                {
+                    "nombre": nombre_completo,
+                    "nit": nit,
+                    "id_vendedor": uuid_vendedor,
+                    "logo_url": (
+                        f"https://storage.googleapis.com/logos/{nombre_completo.lower().replace(' ', '-')}.png"
+                        if random.random() < 0.7 else None
                     )
-                    
-                    self.db.add(cliente)
-                    clientes_creados += 1
-                    
-                    clientes_generados.append({
-                        "id": str(cliente.id),
-                        "nombre": cliente.nombre,
-                        "nit": cliente.nit,
-                        "logoUrl": cliente.logo_url
-                    })
-                else:
-                    intentos_fallidos += 1
+                }
+                for nombre_completo, nit in zip(nombres_completos, nits)
+            ]
+            
+            # ON CONFLICT cubre un NIT registrado en paralelo entre la consulta y el INSERT
+            stmt = (
+                insert(ClienteInstitucional)
+                .values(filas)
+                .on_conflict_do_nothing(index_elements=["nit"])
+                .returning(
+                    ClienteInstitucional.id,
+                    ClienteInstitucional.nombre,
+                    ClienteInstitucional.nit,
+                    ClienteInstitucional.logo_url
+                )
+            )
+            clientes_generados = [
+                {
+                    "id": str(cliente.id),
+                    "nombre": cliente.nombre,
+                    "nit": cliente.nit,
+                    "logoUrl": cliente.logo_url
+                }
+                for cliente in self.db.execute(stmt)
+            ]
+            
+            clientes_creados = len(clientes_generados)
             
             self.db.commit()
             
@@ -1,7 +1,6 @@
 import os
-import json
+import orjson
 from typing import Dict, Any
-from datetime import datetime, date
 from google.cloud import pubsub_v1
 from google.auth import default
 from google.oauth2.service_account import Credentials
@@ -10,15 +9,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime objects."""
-
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super().default(obj)
-
-
 class PubSubService:
     """
     Google Cloud Pub/Sub client for publishing messages.
@@ -70,9 +60,8 @@ class PubSubService:
                 print("PubSub client not properly initialized")
                 return False
 
-            # Convert to JSON using custom encoder that handles datetime objects
-            message_json = json.dumps(event_data, cls=DateTimeEncoder)
-            message_bytes = message_json.encode("utf-8")
+            # orjson serializes datetime/date (ISO 8601) and UUID natively and returns bytes
+            message_bytes = orjson.dumps(event_data)
 
             topic_path = self._publisher.topic_path(self.project_id, self.topic_name)
 
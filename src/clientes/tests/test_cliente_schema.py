@@ -66,6 +66,21 @@ class TestClienteAsignadoResponse:
         assert len(errors) >= 0  # Al menos algunos campos pueden fallar
 
 
+    def test_cliente_response_strips_and_rejects_blank_strings(self):
+        """Test para recortar espacios y rechazar campos que quedan vacíos"""
+        cliente = ClienteAsignadoResponse(id=" C001 ", nombre=" Hospital General ", nit="901234567-8")
+
+        assert cliente.id == "C001"
+        assert cliente.nombre == "Hospital General"
+
+        with pytest.raises(ValidationError) as exc_info:
+            ClienteAsignadoResponse(id="C001", nombre="   ", nit="901234567-8")
+
+        errors = exc_info.value.errors()
+        assert errors[0]["loc"] == ("nombre",)
+        assert errors[0]["type"] == "string_too_short"
+
+
 class TestClienteAsignadoListResponse:
     
     def test_valid_list_response(self):
@@ -4,51 +4,82 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 import uuid
 
-from services.cliente_service import ClienteService
+import orjson
+
+from services import cliente_service as cliente_service_module
+from services.cliente_service import CACHE_INVALIDATION_CHANNEL, ClienteService
 from models.cliente_institucional_model import ClienteInstitucional
 from schemas.cliente_schema import ClienteAsignadoResponse, ClienteAsignadoListResponse
 from db.redis_client import RedisClient
 from schemas.cliente_schema import RegisterRequest
 
 
+# Los Mock(spec=...) se construyen una vez por módulo (la introspección del spec es lo costoso)
+# y se reinician antes de cada test
+@pytest.fixture(scope="module")
+def db_template():
+    return Mock(spec=Session)
+
+
+@pytest.fixture(scope="module")
+def redis_template():
+    redis_client = Mock(spec=RedisClient)
+    redis_client.client = Mock()
+    return redis_client
+
+
+@pytest.fixture(scope="module")
+def cliente_data():
+    vendedor_id = str(uuid.uuid4())
+    cliente = ClienteInstitucional(
+        nombre="Hospital General",
+        nit="901234567-8",
+        id_vendedor=vendedor_id,
+        logo_url="https://storage.googleapis.com/logos/hospital-general.png",
+        address="Calle 45 #10-20, Cartagena" 
+    )
+    cliente.id = uuid.uuid4()
+    return cliente, vendedor_id
+
+
 class TestClienteService:
+
+    @pytest.fixture(autouse=True)
+    def clear_local_cache(self, monkeypatch):
+        cliente_service_module._LOCAL_CACHE.clear()
+        cliente_service_module._PARSED_CACHE.clear()
+        monkeypatch.setattr(
+            cliente_service_module, "_SELLERS_STATE", {"sellers": None, "fetched_at": 0.0, "refreshing": False}
+        )
+        yield
+        cliente_service_module._LOCAL_CACHE.clear()
+        cliente_service_module._PARSED_CACHE.clear()
     
     @pytest.fixture
-    def mock_db(self):
-        return Mock(spec=Session)
+    def mock_db(self, db_template):
+        db_template.reset_mock(return_value=True, side_effect=True)
+        return db_template
     
     @pytest.fixture
-    def mock_redis_client(self):
-        redis_client = Mock(spec=RedisClient)
-        redis_client.is_connected.return_value = True
-        redis_client.client = Mock()
-        return redis_client
+    def mock_redis_client(self, redis_template):
+        redis_template.reset_mock(return_value=True, side_effect=True)
+        redis_template.is_connected.return_value = True
+        return redis_template
     
     @pytest.fixture
     def cliente_service(self, mock_db, mock_redis_client):
         return ClienteService(db=mock_db, redis_client=mock_redis_client)
     
     @pytest.fixture
-    def sample_cliente_data(self):
-        cliente_id = str(uuid.uuid4())
-        vendedor_id = str(uuid.uuid4())
-        
-        cliente = ClienteInstitucional(
-            nombre="Hospital General",
-            nit="901234567-8",
-            id_vendedor=vendedor_id,
-            logo_url="https://storage.googleapis.com/logos/hospital-general.png",
-            address="Calle 45 #10-20, Cartagena" 
-        )
-        cliente.id = uuid.UUID(cliente_id)
-        return cliente, vendedor_id
+    def sample_cliente_data(self, cliente_data):
+        return cliente_data
 
     def test_get_clientes_asignados_success(self, cliente_service, mock_db, mock_redis_client, sample_cliente_data):
         """Test exitoso para obtener clientes asignados"""
         cliente, vendedor_id = sample_cliente_data
         
         # Mock de la consulta a la base de datos
-        mock_db.query.return_value.filter.return_value.all.return_value = [cliente]
+        mock_db.execute.return_value.all.return_value = [(cliente.id, cliente.nombre, cliente.nit, cliente.logo_url)]
         
         # Mock de Redis (sin cache)
         mock_redis_client.client.get.return_value = None
@@ -96,14 +127,115 @@ class TestClienteService:
         assert len(result.clientes) == 1
         
         # Verificar que NO se consultó la base de datos
-        mock_db.query.assert_not_called()
+        mock_db.execute.assert_not_called()
+
+    def test_get_clientes_asignados_json_returns_cached_bytes(self, cliente_service, mock_db, mock_redis_client):
+        """Test para retornar el JSON cacheado sin deserializarlo ni consultar la base de datos"""
+        vendedor_id = str(uuid.uuid4())
+        cached_json = '{"clientes":[],"total":0}'
+        mock_redis_client.client.get.return_value = cached_json
+
+        result = cliente_service.get_clientes_asignados_json(vendedor_id)
+
+        assert result == cached_json.encode()
+        mock_db.execute.assert_not_called()
+
+    def test_get_clientes_asignados_json_caches_db_result(
+        self, cliente_service, mock_db, mock_redis_client, sample_cliente_data
+    ):
+        """Test para serializar una sola vez la consulta y guardar ese mismo JSON en cache"""
+        cliente, vendedor_id = sample_cliente_data
+        mock_redis_client.client.get.return_value = None
+        mock_db.execute.return_value.all.return_value = [(cliente.id, cliente.nombre, cliente.nit, cliente.logo_url)]
+
+        result = cliente_service.get_clientes_asignados_json(vendedor_id)
+
+        assert ClienteAsignadoListResponse.model_validate_json(result).total == 1
+        mock_redis_client.client.setex.assert_called_once_with(
+            f"clientes_asignados:{vendedor_id}", 300, result
+        )
+        mock_redis_client.client.delete.assert_called_once_with(f"clientes_asignados:{vendedor_id}:lock")
+
+    def test_get_clientes_asignados_json_matches_list_response(
+        self, cliente_service, mock_db, mock_redis_client, sample_cliente_data
+    ):
+        """Test para que el JSON armado con el TypeAdapter sea idéntico al del modelo contenedor"""
+        cliente, vendedor_id = sample_cliente_data
+        mock_redis_client.client.get.return_value = None
+        mock_db.execute.return_value.all.return_value = [(cliente.id, cliente.nombre, cliente.nit, cliente.logo_url)]
+
+        result = cliente_service.get_clientes_asignados_json(vendedor_id)
+
+        expected = ClienteAsignadoListResponse(
+            clientes=[
+                ClienteAsignadoResponse(
+                    id=str(cliente.id), nombre=cliente.nombre, nit=cliente.nit, logoUrl=cliente.logo_url
+                )
+            ],
+            total=1
+        )
+        assert result == expected.model_dump_json().encode()
+
+    @patch("services.cliente_service.time.sleep")
+    def test_get_clientes_asignados_json_waits_for_lock_holder(
+        self, mock_sleep, cliente_service, mock_db, mock_redis_client
+    ):
+        """Test para esperar el cache que repuebla otro worker en vez de repetir la consulta"""
+        vendedor_id = str(uuid.uuid4())
+        cached_json = '{"clientes":[],"total":0}'
+        mock_redis_client.client.get.side_effect = [None, cached_json]
+        mock_redis_client.client.set.return_value = None
+
+        result = cliente_service.get_clientes_asignados_json(vendedor_id)
+
+        assert result == cached_json.encode()
+        mock_redis_client.client.set.assert_called_once_with(
+            f"clientes_asignados:{vendedor_id}:lock", "1", nx=True, ex=cliente_service_module.STAMPEDE_LOCK_TTL
+        )
+        mock_sleep.assert_called_once()
+        mock_db.execute.assert_not_called()
+
+    def test_get_clientes_asignados_json_prefers_local_cache(self, cliente_service, mock_db, mock_redis_client):
+        """Test para servir desde la copia en memoria sin consultar Redis, y descartarla al invalidar"""
+        vendedor_id = str(uuid.uuid4())
+        cached_json = '{"clientes":[],"total":0}'
+        mock_redis_client.client.get.return_value = cached_json
+
+        cliente_service.get_clientes_asignados_json(vendedor_id)
+        result = cliente_service.get_clientes_asignados_json(vendedor_id)
+
+        assert result == cached_json.encode()
+        mock_redis_client.client.get.assert_called_once()
+
+        cliente_service.invalidate_cache(vendedor_id)
+        cliente_service.get_clientes_asignados_json(vendedor_id)
+
+        assert mock_redis_client.client.get.call_count == 2
+
+    def test_get_clientes_asignados_bulk(self, cliente_service, mock_db, mock_redis_client, sample_cliente_data):
+        """Test para resolver varios vendedores con un MGET y una sola consulta para los no cacheados"""
+        cliente, vendedor_id = sample_cliente_data
+        vendedor_cacheado = str(uuid.uuid4())
+        mock_redis_client.mget_json.return_value = ['{"clientes":[],"total":0}', None]
+        mock_db.execute.return_value.all.return_value = [
+            (cliente.id_vendedor, cliente.id, cliente.nombre, cliente.nit, cliente.logo_url)
+        ]
+
+        result = cliente_service.get_clientes_asignados_bulk([vendedor_cacheado, vendedor_id])
+
+        assert result[vendedor_cacheado].total == 0
+        assert result[vendedor_id].total == 1
+        assert result[vendedor_id].clientes[0].id == str(cliente.id)
+        mock_db.execute.assert_called_once()
+        mock_redis_client.mset_json.assert_called_once()
+        assert list(mock_redis_client.mset_json.call_args.args[0]) == [f"clientes_asignados:{vendedor_id}"]
 
     def test_get_clientes_asignados_empty_list(self, cliente_service, mock_db, mock_redis_client):
         """Test para cuando no hay clientes asignados"""
         vendedor_id = str(uuid.uuid4())
         
         # Mock de consulta vacía
-        mock_db.query.return_value.filter.return_value.all.return_value = []
+        mock_db.execute.return_value.all.return_value = []
         mock_redis_client.client.get.return_value = None
         
         # Ejecutar método
@@ -119,7 +251,7 @@ class TestClienteService:
         cliente, vendedor_id = sample_cliente_data
         
         # Mock de la consulta
-        mock_db.query.return_value.filter.return_value.first.return_value = cliente
+        mock_db.execute.return_value.first.return_value = (cliente.id, cliente.nombre, cliente.nit, cliente.logo_url)
         
         # Ejecutar método
         result = cliente_service.get_cliente_by_id(str(cliente.id), vendedor_id)
@@ -131,13 +263,50 @@ class TestClienteService:
         assert result.nit == cliente.nit
         assert result.logoUrl == cliente.logo_url
 
+    def test_get_cliente_by_id_from_cache(self, cliente_service, mock_db, mock_redis_client, sample_cliente_data):
+        """Test para obtener un cliente desde la lista cacheada del vendedor sin consultar la base de datos"""
+        cliente, vendedor_id = sample_cliente_data
+        cached_response = ClienteAsignadoListResponse(
+            clientes=[
+                ClienteAsignadoResponse(
+                    id=str(cliente.id),
+                    nombre=cliente.nombre,
+                    nit=cliente.nit,
+                    logoUrl=cliente.logo_url
+                )
+            ],
+            total=1
+        )
+        mock_redis_client.client.get.return_value = cached_response.model_dump_json()
+
+        result = cliente_service.get_cliente_by_id(str(cliente.id), vendedor_id)
+
+        assert result.id == str(cliente.id)
+        assert result.nombre == cliente.nombre
+        mock_db.execute.assert_not_called()
+
+    def test_get_cliente_by_id_reuses_parsed_cache(self, cliente_service, mock_redis_client, sample_cliente_data):
+        """Test para parsear una sola vez la lista cacheada mientras la entrada local no cambie"""
+        cliente, vendedor_id = sample_cliente_data
+        mock_redis_client.client.get.return_value = orjson.dumps({
+            "clientes": [{"id": str(cliente.id), "nombre": cliente.nombre, "nit": cliente.nit, "logoUrl": None}],
+            "total": 1
+        })
+
+        with patch.object(cliente_service_module.orjson, "loads", wraps=orjson.loads) as mock_loads:
+            cliente_service.get_cliente_by_id(str(cliente.id), vendedor_id)
+            result = cliente_service.get_cliente_by_id(str(cliente.id), vendedor_id)
+
+        assert result.nombre == cliente.nombre
+        mock_loads.assert_called_once()
+
     def test_get_cliente_by_id_not_found(self, cliente_service, mock_db):
         """Test cuando el cliente no existe o no está asignado"""
         cliente_id = str(uuid.uuid4())
         vendedor_id = str(uuid.uuid4())
         
         # Mock de consulta sin resultados
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.execute.return_value.first.return_value = None
         
         # Ejecutar método
         result = cliente_service.get_cliente_by_id(cliente_id, vendedor_id)
@@ -153,7 +322,42 @@ class TestClienteService:
         cliente_service.invalidate_cache(vendedor_id)
         
         # Verificaciones
-        mock_redis_client.client.delete.assert_called_once_with(f"clientes_asignados:{vendedor_id}")
+        pipeline = mock_redis_client.client.pipeline.return_value
+        pipeline.delete.assert_called_once_with(f"clientes_asignados:{vendedor_id}")
+        pipeline.publish.assert_called_once_with(CACHE_INVALIDATION_CHANNEL, vendedor_id)
+        pipeline.execute.assert_called_once()
+
+    def test_invalidation_message_evicts_local_cache(self):
+        """Test para descartar la copia local al recibir el aviso de invalidación (payload en bytes)"""
+        vendedor_id = str(uuid.uuid4())
+        cliente_service_module._LOCAL_CACHE[f"clientes_asignados:{vendedor_id}"] = b'{"clientes":[],"total":0}'
+
+        cliente_service_module._on_cache_invalidation({"data": vendedor_id.encode()})
+
+        assert f"clientes_asignados:{vendedor_id}" not in cliente_service_module._LOCAL_CACHE
+
+    def test_invalidate_all_caches(self, cliente_service, mock_redis_client):
+        """Test para borrar el namespace completo en Redis y avisar a los demás procesos"""
+        cliente_service_module._LOCAL_CACHE["clientes_asignados:v1"] = b'{"clientes":[],"total":0}'
+
+        cliente_service.invalidate_all_caches()
+
+        assert len(cliente_service_module._LOCAL_CACHE) == 0
+        mock_redis_client.invalidate_namespace.assert_called_once_with("clientes_asignados:")
+        mock_redis_client.client.publish.assert_called_once_with(
+            CACHE_INVALIDATION_CHANNEL, cliente_service_module.INVALIDATE_ALL
+        )
+
+    def test_invalidate_caches_uses_one_pipeline(self, cliente_service, mock_redis_client):
+        """Test para invalidar varios vendedores en un solo round-trip"""
+        vendedor_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+
+        cliente_service.invalidate_caches(vendedor_ids)
+
+        pipeline = mock_redis_client.client.pipeline.return_value
+        assert pipeline.delete.call_count == 2
+        assert pipeline.publish.call_count == 2
+        pipeline.execute.assert_called_once()
 
     def test_redis_not_connected(self, cliente_service, mock_db, mock_redis_client, sample_cliente_data):
         """Test cuando Redis no está conectado"""
@@ -161,7 +365,7 @@ class TestClienteService:
         
         # Mock de Redis desconectado
         mock_redis_client.is_connected.return_value = False
-        mock_db.query.return_value.filter.return_value.all.return_value = [cliente]
+        mock_db.execute.return_value.all.return_value = [(cliente.id, cliente.nombre, cliente.nit, cliente.logo_url)]
         
         # Ejecutar método
         result = cliente_service.get_clientes_asignados(vendedor_id)
@@ -185,28 +389,29 @@ class TestClienteService:
         cliente.fecha_actualizacion = "2025-02-01"
         cliente.id_vendedor = uuid.uuid4()
 
-        mock_db.query.return_value.all.return_value = [cliente]
+        mock_db.execute.return_value = [cliente]
         service = ClienteService(db=mock_db, redis_client=Mock())
 
-        result = service.get_all_clients(mock_db)
+        result = orjson.loads(service.get_all_clients(mock_db))
         assert len(result) == 1
-        assert result[0].nombre == "Clinica ABC"
+        assert result[0]["nombre"] == "Clinica ABC"
+        assert result[0]["logoUrl"] == "https://example.com/logo.png"
+        assert result[0]["id_vendedor"] == str(cliente.id_vendedor)
 
     def test_get_all_clients_error(self, mock_db):
-        mock_db.query.side_effect = Exception("DB error")
+        mock_db.execute.side_effect = Exception("DB error")
         service = ClienteService(db=mock_db, redis_client=Mock())
 
         with pytest.raises(Exception):
             service.get_all_clients(mock_db)
 
-    @patch("services.cliente_service.httpx.get")
+    @patch.object(cliente_service_module._AUTH_CLIENT, "get")
     def test_register_client_success(self, mock_httpx_get, mock_db):
         """Test exitoso para registrar un cliente institucional (mockeando llamada externa)"""
         # Mockear llamada al servicio externo
         mock_httpx_get.return_value = Mock(status_code=200)
-        mock_httpx_get.return_value.json.return_value = [
-            {"id": str(uuid.uuid4()), "nombre": "Vendedor 1"}
-        ]
+        vendedor_id = str(uuid.uuid4())
+        mock_httpx_get.return_value.json.return_value = [vendedor_id]
 
         # Datos simulados
         data = RegisterRequest(
@@ -215,23 +420,39 @@ class TestClienteService:
             address="Cra 1 #1-1",
             logoUrl="https://logo.com"
         )
-        new_client = Mock()
-        new_client.to_dict.return_value = {
-            "id": str(uuid.uuid4()),
-            "nombre": data.nombre,
-            "nit": data.nit,
-            "logoUrl": data.logoUrl,
-            "address": data.address,
-            "id_vendedor": str(uuid.uuid4()),
-            "fecha_creacion": "2025-01-01T00:00:00Z",  
-            "fecha_actualizacion": "2025-01-01T00:00:00Z"  
-        }
-
-        mock_db.refresh.side_effect = lambda x: x.__setattr__('to_dict', new_client.to_dict)
+        def refresh(cliente):
+            # Simula los valores que asigna la base de datos al insertar
+            cliente.id = uuid.uuid4()
+            cliente.fecha_creacion = datetime(2025, 1, 1, tzinfo=timezone.utc)
+            cliente.fecha_actualizacion = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        mock_db.refresh.side_effect = refresh
         service = ClienteService(db=mock_db, redis_client=Mock())
         
         result = service.register_client(mock_db, data)
         assert result.nombre == data.nombre
+        assert result.logoUrl == data.logoUrl
+        assert result.id_vendedor == vendedor_id
+        service.redis_client.client.pipeline.return_value.delete.assert_called_once_with(
+            f"clientes_asignados:{vendedor_id}"
+        )
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
         mock_httpx_get.assert_called_once()
+
+    @patch.object(cliente_service_module._AUTH_CLIENT, "get")
+    def test_get_sellers_reuses_cached_list(self, mock_httpx_get, mock_db, mock_redis_client):
+        """Test para consultar autenticación una sola vez mientras la lista de vendedores siga vigente"""
+        sellers = [str(uuid.uuid4())]
+        mock_httpx_get.return_value = Mock(status_code=200)
+        mock_httpx_get.return_value.json.return_value = sellers
+        mock_redis_client.client.get.return_value = None
+        service = ClienteService(db=mock_db, redis_client=mock_redis_client)
+
+        assert service._get_sellers() == sellers
+        assert service._get_sellers() == sellers
+
+        mock_httpx_get.assert_called_once_with("/auth/sellers")
+        mock_redis_client.client.setex.assert_called_once_with(
+            cliente_service_module.SELLERS_CACHE_KEY, cliente_service_module.SELLERS_TTL, orjson.dumps(sellers)
+        )
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -50,9 +51,18 @@ class HealthService:
     
     def check_overall_health(self) -> Dict[str, Any]:
         """Check overall system health"""
-        db_health = self.check_database_health()
-        cache_health = self.check_cache_health()
-        
+        return self._overall(self.check_database_health(), self.check_cache_health())
+
+    async def check_overall_health_async(self) -> Dict[str, Any]:
+        """Check overall system health running the database and cache pings concurrently"""
+        db_health, cache_health = await asyncio.gather(
+            asyncio.to_thread(self.check_database_health),
+            asyncio.to_thread(self.check_cache_health)
+        )
+        return self._overall(db_health, cache_health)
+
+    @staticmethod
+    def _overall(db_health: Dict[str, Any], cache_health: Dict[str, Any]) -> Dict[str, Any]:
         overall_healthy = (
             db_health["status"] == "healthy" and 
             cache_health["status"] == "healthy"
@@ -25,24 +25,25 @@ class FakeDB:
         return SimpleNamespace()
 
 
+class _FakeRedisConnection:
+    def __init__(self, connected: bool):
+        self._connected = connected
+
+    def ping(self):
+        return self._connected
+
+
 class FakeRedisClient:
     def __init__(self, should_fail: bool = False, connected: bool = True):
         self.should_fail = should_fail
         self.connected = connected
+        self._inner = _FakeRedisConnection(connected)
 
     @property
     def client(self):
         if self.should_fail:
             raise RuntimeError("Redis error")
-
-        class _Client:
-            def __init__(self, connected: bool):
-                self._connected = connected
-
-            def ping(self):
-                return self._connected
-
-        return _Client(self.connected)
+        return self._inner
 
 
 @pytest.fixture
@@ -1,3 +1,4 @@
+import atexit
 import os
 import redis
 from typing import Optional
@@ -26,17 +27,23 @@ class RedisClient:
         redis_password = os.getenv("REDIS_PASSWORD", None)
         
         try:
-            self._client = redis.Redis(
+            # Pool acotado compartido por los hilos del worker: cada comando toma una conexión
+            # abierta y la devuelve; si están todas ocupadas espera hasta `timeout` en vez de abrir más
+            pool = redis.BlockingConnectionPool(
                 host=redis_host,
                 port=redis_port,
                 db=redis_db,
                 password=redis_password,
+                max_connections=int(os.getenv("REDIS_POOL_SIZE", "32")),
+                timeout=5,
                 decode_responses=True,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
                 health_check_interval=30
             )
+            self._client = redis.Redis(connection_pool=pool)
+            atexit.register(pool.disconnect)
             self._client.ping()
             logger.info(f"Successfully connected to Redis at {redis_host}:{redis_port}")
         except redis.ConnectionError as e:
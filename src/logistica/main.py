@@ -5,8 +5,8 @@ app = FastAPI()
 
 
 @app.get("/health")
-def health_check(health_service: HealthService = Depends(get_health_service)):
-    health_status = health_service.check_overall_health()
+async def health_check(health_service: HealthService = Depends(get_health_service)):
+    health_status = await health_service.check_overall_health_async()
     
     if health_status["status"] != "healthy":
         raise HTTPException(status_code=503, detail=health_status)
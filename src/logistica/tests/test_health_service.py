@@ -1,3 +1,5 @@
+import asyncio
+
 from services.health_service import HealthService
 
 
@@ -43,3 +45,11 @@ def test_overall_unhealthy_when_any_fails(failing_db_deps):
     assert result["status"] == "unhealthy"
 
 
+def test_overall_health_async_matches_sync(healthy_deps, failing_cache_deps):
+    service = HealthService(db=healthy_deps["db"], redis_client=healthy_deps["redis_client"])
+    assert asyncio.run(service.check_overall_health_async()) == service.check_overall_health()
+
+    service = HealthService(db=failing_cache_deps["db"], redis_client=failing_cache_deps["redis_client"])
+    result = asyncio.run(service.check_overall_health_async())
+    assert result["status"] == "unhealthy"
+    assert result["cache"]["status"] == "unhealthy"
@@ -12,8 +12,8 @@ class DetalleOrden(Base):
     __tablename__ = "detalles_ordenes"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    fecha_creacion = Column(DateTime, default=datetime.now())
-    fecha_actualizacion = Column(DateTime, default=datetime.now())
+    fecha_creacion = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    fecha_actualizacion = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     id_orden = Column(UUID(as_uuid=True), ForeignKey("ordenes.id"), nullable=False)
     id_producto = Column(UUID(as_uuid=True), nullable=False)
     cantidad = Column(Integer, nullable=False)
@@ -22,8 +22,9 @@ class DetalleOrden(Base):
     observaciones = Column(String, nullable=True)
     orden = relationship("Orden", back_populates="detalles")
 
-    def __init__(self, id_orden, id_producto, cantidad, precio_unitario, observaciones):
-        now = datetime.now(timezone.utc)
+    def __init__(self, id_orden, id_producto, cantidad, precio_unitario, observaciones, fecha_creacion=None):
+        # Los detalles creados junto con su orden reciben su misma marca de tiempo
+        now = fecha_creacion or datetime.now(timezone.utc)
         self.fecha_creacion = now
         self.fecha_actualizacion = now
         self.id_orden = id_orden
@@ -52,8 +53,8 @@ class Orden(Base):
     __tablename__ = "ordenes"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    fecha_creacion = Column(DateTime, default=datetime.now())
-    fecha_actualizacion = Column(DateTime, default=datetime.now())
+    fecha_creacion = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    fecha_actualizacion = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     numero_orden = Column(String, nullable=False, unique=True)
     estado = Column(String, nullable=False)
     valor_total = Column(Numeric, nullable=False)
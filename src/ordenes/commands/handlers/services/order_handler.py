@@ -55,6 +55,7 @@ class OrderHandler:
                         cantidad=detalle["cantidad"],
                         precio_unitario=detalle["precio_unitario"],
                         observaciones=detalle["observaciones"],
+                        fecha_creacion=order.fecha_creacion,
                     )
                 )
             order.detalles = detalle_orden
@@ -100,6 +100,7 @@ async def listar_proveedores(
     tipo_proveedor: Optional[TipoProveedorEnum] = Query(None, description="Filtrar por tipo de proveedor"),
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(20, ge=1, le=100, description="Tamaño de página (máximo 100)"),
+    ids: Optional[str] = Query(None, description="IDs de proveedores separados por coma (ignora filtros y paginación)"),
     proveedor_service: ProveedorService = Depends(get_proveedor_service)
 ):
     """
@@ -108,7 +109,20 @@ async def listar_proveedores(
     - **Filtros**: Por país y tipo de proveedor
     - **Paginación**: Con page (número de página) y page_size (tamaño)
     - **Ordenamiento**: Por fecha de creación (más recientes primero)
+    - **Búsqueda por lote**: Con ids retorna solo los proveedores indicados
     """
+    if ids:
+        proveedores = proveedor_service.obtener_proveedores_por_ids(
+            [proveedor_id.strip() for proveedor_id in ids.split(",") if proveedor_id.strip()]
+        )
+        return {
+            "data": proveedores,
+            "total": len(proveedores),
+            "page": 1,
+            "page_size": len(proveedores),
+            "total_pages": 1 if proveedores else 0
+        }
+    
     skip = (page - 1) * page_size
     
     pais_value = pais.value if pais else None
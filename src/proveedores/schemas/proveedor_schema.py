@@ -1,10 +1,27 @@
-from pydantic import Field, BaseModel, EmailStr, field_validator, model_validator
+from pydantic import Field, BaseModel, ConfigDict, EmailStr, field_validator, model_validator
 from datetime import datetime
 from typing import Optional
 from enum import Enum
 import re
 
 
+_CREAR_PROVEEDOR_EXAMPLE = {
+    "nombre": "Farmacéutica Nacional S.A.",
+    "id_tributario": "20123456789",
+    "tipo_proveedor": "Fabricante",
+    "email": "contacto@farmaceutica.com",
+    "pais": "Perú",
+    "contacto": "Juan Pérez - +51 999 888 777",
+    "condiciones_entrega": "Entrega en 5 días hábiles, cobertura nacional"
+}
+
+_ACTUALIZAR_PROVEEDOR_EXAMPLE = {
+    "nombre": "Farmacéutica Nacional S.A.C.",
+    "email": "nuevo@farmaceutica.com",
+    "contacto": "María García - +51 999 777 888"
+}
+
+
 class PaisEnum(str, Enum):
     COLOMBIA = "Colombia"
     PERU = "Perú"
@@ -65,21 +82,22 @@ class CrearProveedorSchema(BaseModel):
         """
         id_trib = self.id_tributario.strip()
         pais = self.pais
+        PE, CO, MX, EC = PaisEnum.PERU, PaisEnum.COLOMBIA, PaisEnum.MEXICO, PaisEnum.ECUADOR
         
-        if pais == PaisEnum.PERU:
+        if pais is PE:
             # RUC: 11 dígitos
             if not re.match(r'^\d{11}$', id_trib):
                 raise ValueError('RUC debe tener 11 dígitos numéricos')
-        elif pais == PaisEnum.COLOMBIA:
+        elif pais is CO:
             # NIT: 9-10 dígitos
             if not re.match(r'^\d{9,10}$', id_trib):
                 raise ValueError('NIT debe tener 9 o 10 dígitos numéricos')
-        elif pais == PaisEnum.MEXICO:
+        elif pais is MX:
             # RFC: 12-13 caracteres alfanuméricos
             if not re.match(r'^[A-ZÑ&]{3,4}\d{6}[A-Z0-9]{3}$', id_trib.upper()):
                 raise ValueError('RFC debe tener formato válido (12-13 caracteres alfanuméricos)')
             self.id_tributario = id_trib.upper()
-        elif pais == PaisEnum.ECUADOR:
+        elif pais is EC:
             # RUC Ecuador: 13 dígitos
             if not re.match(r'^\d{13}$', id_trib):
                 raise ValueError('RUC debe tener 13 dígitos numéricos')
@@ -96,18 +114,7 @@ class CrearProveedorSchema(BaseModel):
             raise ValueError('El campo no puede estar vacío')
         return v.strip() if v else v
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "nombre": "Farmacéutica Nacional S.A.",
-                "id_tributario": "20123456789",
-                "tipo_proveedor": "Fabricante",
-                "email": "contacto@farmaceutica.com",
-                "pais": "Perú",
-                "contacto": "Juan Pérez - +51 999 888 777",
-                "condiciones_entrega": "Entrega en 5 días hábiles, cobertura nacional"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _CREAR_PROVEEDOR_EXAMPLE})
 
 
 class ActualizarProveedorSchema(BaseModel):
@@ -144,11 +151,4 @@ class ActualizarProveedorSchema(BaseModel):
             raise ValueError('El campo no puede estar vacío')
         return v.strip() if v else v
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "nombre": "Farmacéutica Nacional S.A.C.",
-                "email": "nuevo@farmaceutica.com",
-                "contacto": "María García - +51 999 777 888"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _ACTUALIZAR_PROVEEDOR_EXAMPLE})
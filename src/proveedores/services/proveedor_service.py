@@ -6,6 +6,7 @@ from http import HTTPStatus
 from datetime import datetime, timezone
 import logging
 import json
+import uuid
 
 from db.database import get_db
 from db.proveedor_model import Proveedor
@@ -191,6 +192,37 @@ class ProveedorService:
                 detail="Error interno al obtener el proveedor."
             )
 
+    def obtener_proveedores_por_ids(self, proveedor_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Obtiene varios proveedores por sus IDs en una sola consulta.
+        
+        Args:
+            proveedor_ids: IDs de los proveedores
+            
+        Returns:
+            Lista con los proveedores encontrados; los IDs inválidos o
+            inexistentes se omiten
+        """
+        ids = []
+        for proveedor_id in proveedor_ids:
+            try:
+                ids.append(uuid.UUID(proveedor_id))
+            except ValueError:
+                continue
+        
+        if not ids:
+            return []
+        
+        try:
+            proveedores = self.db.query(Proveedor).filter(Proveedor.id.in_(ids)).all()
+            return [proveedor.to_dict() for proveedor in proveedores]
+        except Exception as e:
+            logger.error(f"Error al obtener proveedores por IDs: {e}")
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Error interno al obtener los proveedores."
+            )
+    
     def listar_proveedores(
         self,
         pais: Optional[str] = None,
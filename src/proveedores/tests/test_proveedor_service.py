@@ -249,6 +249,35 @@ class TestListarProveedores:
         assert not mock_db.all.called  # DB was NOT queried
 
 
+class TestObtenerProveedoresPorIds:
+    """Tests para obtener proveedores por lote de IDs"""
+    
+    def test_obtener_proveedores_por_ids(self, mock_db, mock_redis, mock_proveedor):
+        """Test: Obtener varios proveedores en una sola consulta"""
+        # Arrange
+        proveedor_service = get_service(mock_db, mock_redis)
+        mock_db.all.return_value = [mock_proveedor]
+        
+        # Act
+        result = proveedor_service.obtener_proveedores_por_ids([str(mock_proveedor.id), "no-es-uuid"])
+        
+        # Assert
+        assert result == [mock_proveedor.to_dict()]
+        assert mock_db.query.call_count == 1
+        
+    def test_obtener_proveedores_por_ids_invalidos(self, mock_db, mock_redis):
+        """Test: IDs inválidos no generan consulta a la base de datos"""
+        # Arrange
+        proveedor_service = get_service(mock_db, mock_redis)
+        
+        # Act
+        result = proveedor_service.obtener_proveedores_por_ids(["no-es-uuid"])
+        
+        # Assert
+        assert result == []
+        assert not mock_db.query.called
+
+
 class TestActualizarProveedor:
     """Tests para actualizar proveedores"""
     